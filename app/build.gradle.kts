@@ -29,8 +29,6 @@ android {
                 pip {
                     install("python-dotenv")
                     install("requests")
-                    install("beautifulsoup4")
-                    install("lxml")
                 }
             }
         }
@@ -3,6 +3,7 @@ package com.example.wodifyplus.ui.screens.home
 import android.app.Application
 import androidx.lifecycle.AndroidViewModel
 import androidx.lifecycle.viewModelScope
+import com.chaquo.python.Kwarg
 import com.chaquo.python.Python
 import com.chaquo.python.android.AndroidPlatform
 import com.example.wodifyplus.data.local.WodDatabase
@@ -47,14 +48,17 @@ class HomeViewModel(application: Application) : AndroidViewModel(application) {
             _uiState.value = HomeUiState.Loading
 
             try {
-                val result = withContext(Dispatchers.IO) {
+                val jsonString = withContext(Dispatchers.IO) {
                     val py = Python.getInstance()
                     val module = py.getModule("wod_scraper")
-                    module.callAttr("main").toString()
+                    // Los WODs llegan como bytes JSON y el registro del proceso en un campo aparte
+                    val resultado = module.callAttr("obtener_wods", Kwarg("serializado", true))
+                    android.util.Log.d("WodParser", resultado.callAttr("get", "log").toString())
+                    resultado.callAttr("get", "wods")?.toJava(ByteArray::class.java)?.toString(Charsets.UTF_8)
                 }
 
                 // Parsear resultado y guardar en BD
-                val wodsGuardados = parseAndSaveWods(result)
+                val wodsGuardados = parseAndSaveWods(jsonString)
 
                 // Mensaje limpio de éxito
                 val mensaje = if (wodsGuardados > 0) {
@@ -70,25 +74,16 @@ class HomeViewModel(application: Application) : AndroidViewModel(application) {
         }
     }
 
-    private suspend fun parseAndSaveWods(result: String): Int {
+    private suspend fun parseAndSaveWods(jsonString: String?): Int {
         try {
-            // Extraer el JSON del resultado
-            val jsonStartMarker = "JSON_DATA_START"
-            val jsonEndMarker = "JSON_DATA_END"
-            
-            val jsonStart = result.indexOf(jsonStartMarker)
-            val jsonEnd = result.indexOf(jsonEndMarker)
-            
-            if (jsonStart == -1 || jsonEnd == -1) {
-                android.util.Log.e("WodParser", "No se encontraron marcadores JSON")
+            if (jsonString == null) {
+                android.util.Log.e("WodParser", "El scraper no devolvió WODs")
                 // Si no hay JSON, crear WODs de prueba
                 val wods = createSampleWods()
                 repository.insertWods(wods)
                 return wods.size
             }
             
-            val jsonString = result.substring(jsonStart + jsonStartMarker.length, jsonEnd).trim()
-            
             // LOG: Imprimir JSON completo
             android.util.Log.d("WodParser", "=== JSON COMPLETO ===")
             android.util.Log.d("WodParser", jsonString)
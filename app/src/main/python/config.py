@@ -1,42 +1,46 @@
 import os
-from dotenv import load_dotenv
+from json_rapido import cargar_json, volcar_json
+import threading
 import sys
+from functools import lru_cache
+from registro import obtener_registro
 
-def log_message(message):
-    """Loggea a consola o a Logcat si está en Android."""
+log_config = obtener_registro("WodifyConfig")
+
+# Función para cargar el .env una sola vez por proceso (las siguientes llamadas devuelven lo mismo)
+@lru_cache(maxsize=None)
+def cargar_entorno():
+    """Devuelve True si se encontró y cargó el .env."""
+    from dotenv import load_dotenv
+    
+    log_config("Cargando variables de entorno desde .env...")
+    env_path = None
     try:
-        # Intentar importar Log de Android
-        from android.util import Log
-        Log.d("WodifyConfig", str(message))
+        # Intentar determinar la ruta RELATIVA al script actual en Android
+        from com.chaquo.python import Python # Solo para detectar Android
+        # __file__ nos da la ruta del script config.py DENTRO del entorno Chaquopy
+        script_dir = os.path.dirname(__file__)
+        env_path = os.path.join(script_dir, '.env')
+        log_config(f"Ruta calculada para .env en Android: {env_path}")
+        if not os.path.exists(env_path):
+            log_config.warning("¡Alerta! .env no encontrado en la ruta calculada.")
     except ImportError:
-        # Si no está en Android, imprimir a consola
-        print(f"[ConfigLog] {message}")
-
-log_message("Cargando variables de entorno desde .env...")
-env_path = None
-try:
-    # Intentar determinar la ruta RELATIVA al script actual en Android
-    from com.chaquo.python import Python # Solo para detectar Android
-    # __file__ nos da la ruta del script config.py DENTRO del entorno Chaquopy
-    script_dir = os.path.dirname(__file__)
-    env_path = os.path.join(script_dir, '.env')
-    log_message(f"Ruta calculada para .env en Android: {env_path}")
-    if not os.path.exists(env_path):
-        log_message("¡Alerta! .env no encontrado en la ruta calculada.")
-except ImportError:
-    # Fuera de Android, buscar en el directorio actual (comportamiento por defecto)
-    log_message("Ejecutando fuera de Android, load_dotenv buscará localmente.")
-    env_path = None # Dejar que load_dotenv lo busque solo
-
-# Cargar .env usando la ruta calculada si existe, o dejar que lo busque por defecto
-loaded = load_dotenv(dotenv_path=env_path) if env_path else load_dotenv()
-
-# --- Añadir log para ver si la carga fue exitosa ---
-if loaded:
-    log_message(".env cargado exitosamente.")
-else:
-    log_message("Fallo al cargar .env (¿existe en la ruta correcta?).")
-# --- Fin del log de éxito/fallo ---
+        # Fuera de Android, buscar en el directorio actual (comportamiento por defecto)
+        log_config("Ejecutando fuera de Android, load_dotenv buscará localmente.")
+        env_path = None # Dejar que load_dotenv lo busque solo
+    
+    # Cargar .env usando la ruta calculada si existe, o dejar que lo busque por defecto
+    loaded = load_dotenv(dotenv_path=env_path) if env_path else load_dotenv()
+    
+    # --- Añadir log para ver si la carga fue exitosa ---
+    if loaded:
+        log_config(".env cargado exitosamente.")
+    else:
+        log_config.warning("Fallo al cargar .env (¿existe en la ruta correcta?).")
+    # --- Fin del log de éxito/fallo ---
+    return loaded
+
+cargar_entorno()
 
 # Configuración del correo electrónico (sin logs detallados)
 EMAIL_CONFIG = {
@@ -53,5 +57,64 @@ CROSSFITDB_CONFIG = {
     "username": os.getenv("CFDB_USERNAME"),
     "password": os.getenv("CFDB_PASSWORD"),
     "id_user": os.getenv("CFDB_ID_USER"),
-    "id_application": os.getenv("CFDB_ID_APPLICATION")
-}
\ No newline at end of file
+    "id_application": os.getenv("CFDB_ID_APPLICATION"),
+    # Número máximo de días que se consultan en paralelo (1 = secuencial)
+    "max_workers": int(os.getenv("CFDB_MAX_WORKERS", 4)),
+    # Segundos que se reutiliza el token de sesión guardado en disco
+    "token_ttl": int(os.getenv("CFDB_TOKEN_TTL", 12 * 3600)),
+    # Segundos que se reutiliza una respuesta del planner sin ETag/Last-Modified
+    "planner_ttl": int(os.getenv("CFDB_PLANNER_TTL", 6 * 3600))
+}
+
+# Configuración de la sincronización incremental de WODs
+SYNC_CONFIG = {
+    "incremental": os.getenv("WODIFY_SYNC_INCREMENTAL", "1") != "0",
+    # Segundos que se considera fresco un WOD ya descargado
+    "ttl_wod": int(os.getenv("WODIFY_TTL_WOD", 6 * 3600)),
+    # Segundos hasta volver a consultar un día en el que no se encontró WOD
+    "ttl_sin_wod": int(os.getenv("WODIFY_TTL_SIN_WOD", 3600)),
+    # Segundos máximos de espera por cada gimnasio antes de darlo por vacío
+    "timeout_fuente": float(os.getenv("WODIFY_TIMEOUT_FUENTE", 90))
+}
+
+@lru_cache(maxsize=None)
+def obtener_directorio_cache():
+    """
+    Devuelve (creándolo si hace falta) el directorio donde los scrapers guardan su caché.
+    Se calcula una vez: en Android pedir el directorio a la app cuesta llamadas a Java.
+    """
+    directorio = os.getenv("WODIFY_CACHE_DIR")
+    if not directorio:
+        try:
+            # En Android usar el directorio de caché de la app
+            from com.chaquo.python import Python
+            directorio = os.path.join(str(Python.getPlatform().getApplication().getCacheDir()), "wodify")
+        except ImportError:
+            # Fuera de Android, junto a los scripts
+            directorio = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+def leer_cache(nombre):
+    """Lee un archivo JSON de la caché. Devuelve None si no existe o está corrupto."""
+    ruta = os.path.join(obtener_directorio_cache(), nombre)
+    try:
+        with open(ruta, "rb") as f:
+            return cargar_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+def escribir_cache(nombre, datos):
+    """Guarda datos como JSON en la caché de forma atómica. Devuelve True si se guardó."""
+    ruta = os.path.join(obtener_directorio_cache(), nombre)
+    try:
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        # Escribir en un temporal propio del hilo y renombrar para no dejar el archivo a medias
+        ruta_tmp = f"{ruta}.{threading.get_ident()}.tmp"
+        with open(ruta_tmp, "w", encoding="utf-8") as f:
+            f.write(volcar_json(datos))
+        os.replace(ruta_tmp, ruta)
+        return True
+    except OSError as e:
+        log_config.warning(f"No se pudo guardar {nombre} en caché: {e}")
+        return False
\ No newline at end of file
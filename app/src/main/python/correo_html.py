@@ -0,0 +1,368 @@
+import base64
+from collections.abc import Iterable
+from string import Formatter
+
+# Capa de renderizado de los correos: las plantillas se trocean una sola vez al importar
+# el módulo y el HTML se genera como una secuencia de fragmentos, que se vuelcan a la
+# parte MIME sin construir antes el documento completo a base de concatenaciones.
+
+# Bytes de entrada por cada línea de 76 caracteres en base64
+BYTES_POR_LINEA_BASE64 = 57
+
+# Función para trocear una plantilla de str.format en (literal, campo)
+def compilar_plantilla(texto):
+    """Las llaves dobles ({{ }}) quedan ya convertidas en llaves simples en los literales."""
+    return tuple((literal, campo) for literal, campo, _, _ in Formatter().parse(texto))
+
+# Función para recorrer una plantilla compilada devolviendo sus fragmentos
+def fragmentos_plantilla(plantilla, **valores):
+    """Los valores que son secuencias de fragmentos (p. ej. generadores) se recorren en su sitio."""
+    for literal, campo in plantilla:
+        if literal:
+            yield literal
+        if campo is None:
+            continue
+        valor = valores[campo]
+        if isinstance(valor, str):
+            yield valor
+        elif isinstance(valor, Iterable):
+            yield from valor
+        else:
+            yield str(valor)
+
+# Función para crear la parte text/html de un correo a partir de sus fragmentos
+def parte_html(fragmentos):
+    """
+    Equivale a MIMEText(html, "html", "utf-8"), pero codifica cada fragmento según llega
+    en lugar de recibir el HTML completo.
+    """
+    # El paquete email solo se carga cuando se envía un correo
+    from email.mime.nonmultipart import MIMENonMultipart
+    
+    parte = MIMENonMultipart("text", "html", charset="utf-8")
+    parte["Content-Transfer-Encoding"] = "base64"
+    codificado = []
+    pendiente = bytearray()
+    for fragmento in fragmentos:
+        pendiente += fragmento.encode("utf-8")
+        # Solo se codifican líneas completas; el resto espera al siguiente fragmento
+        corte = len(pendiente) - len(pendiente) % BYTES_POR_LINEA_BASE64
+        if corte:
+            codificado.append(base64.encodebytes(pendiente[:corte]).decode("ascii"))
+            del pendiente[:corte]
+    if pendiente:
+        codificado.append(base64.encodebytes(pendiente).decode("ascii"))
+    parte.set_payload("".join(codificado))
+    return parte
+
+
+# Correo unificado (wod_scraper): plantilla HTML con estilos modernos
+PLANTILLA_CORREO_UNIFICADO = compilar_plantilla("""
+        <!DOCTYPE html>
+        <html lang="es">
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                body {{
+                    font-family: 'Segoe UI', Arial, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 800px;
+                    margin: 0 auto;
+                }}
+                .header {{
+                    text-align: center;
+                    padding: 20px;
+                    background: linear-gradient(135deg, #6650a4 0%, #4a3b82 100%);
+                    color: white;
+                    border-radius: 10px;
+                    margin-bottom: 30px;
+                }}
+                .day-section {{
+                    margin-bottom: 40px;
+                    border: 1px solid #e0e0e0;
+                    border-radius: 10px;
+                    overflow: hidden;
+                }}
+                .day-header {{
+                    background-color: #6650a4;
+                    color: white;
+                    padding: 15px;
+                    font-size: 1.2em;
+                    font-weight: bold;
+                    text-align: center;
+                }}
+                .gym-section {{
+                    border-top: 1px solid #eee;
+                    margin-bottom: 10px;
+                }}
+                .gym-header {{
+                    background-color: #ede7f6; /* Morado más claro */
+                    padding: 12px 15px;
+                    font-size: 1.1em;
+                    font-weight: bold;
+                    color: #4a3b82; /* Mantener texto morado oscuro */
+                    display: flex;
+                    align-items: center;
+                }}
+                .wod-content {{
+                    padding: 20px;
+                    background-color: #fff;
+                }}
+                .workout-type {{
+                    font-weight: bold;
+                    color: #4a3b82;
+                    margin: 10px 0;
+                }}
+                .workout-details {{
+                    margin-left: 15px;
+                    color: #555;
+                }}
+                .footer {{
+                    text-align: center;
+                    padding: 20px;
+                    color: #666;
+                    font-size: 0.9em;
+                }}
+                .version {{
+                    text-align: center;
+                    color: #999;
+                    font-size: 0.8em;
+                    margin-top: 10px;
+                }}
+                .no-wod {{
+                    padding: 15px;
+                    color: #777;
+                    font-style: italic;
+                    text-align: center;
+                }}
+                .logo-img {{
+                    height: 30px;
+                    vertical-align: middle;
+                    margin-right: 10px;
+                    display: inline-block;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>
+                    <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/logo%20db%20negro.png" 
+                         alt="CrossFit DB" 
+                         style="height: 40px; vertical-align: middle; margin-right: 15px;">
+                    WODs {lunes_fmt} - {viernes_fmt}
+                    <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/converted_image_transparent.png" 
+                         alt="Box N8" 
+                         style="height: 40px; vertical-align: middle; margin-left: 15px;">
+                </h1>
+                <p>CrossFit DB y Box N8</p>
+            </div>
+            
+            {contenido}
+            
+            <div class="footer">
+                Generado por WOD Scraper v4.1.0<br>
+                {fecha_generacion}
+            </div>
+        </body>
+        </html>
+        """)
+
+# Sección de cada día
+PLANTILLA_DIA_UNIFICADO = compilar_plantilla("""
+                <div class="day-section">
+                    <div class="day-header">
+                        {dia_semana} {fecha}
+                    </div>
+                """)
+
+# Cabeceras de cada gimnasio dentro del día
+CABECERA_CROSSFITDB_UNIFICADO = """
+                    <div class="gym-section">
+                        <div class="gym-header">
+                            <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/logo%20db%20negro.png" 
+                                 alt="CrossFit DB" class="logo-img">
+                            <span>CrossFit DB</span>
+                        </div>
+                """
+CABECERA_N8_UNIFICADO = """
+                    <div class="gym-section">
+                        <div class="gym-header">
+                            <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/converted_image_transparent.png" 
+                                 alt="Box N8" class="logo-img">
+                            <span>Box N8</span>
+                        </div>
+                """
+
+# Contenido del WOD de un gimnasio, o aviso si ese día no hay WOD
+PLANTILLA_WOD_UNIFICADO = compilar_plantilla("""
+                        <div class="wod-content">
+                            {contenido}
+                        </div>
+                    """)
+SIN_WOD_UNIFICADO = """
+                        <div class="no-wod">
+                            No hay WOD disponible para este día
+                        </div>
+                    """
+
+# Contenido cuando no hay WODs en toda la semana
+SIN_WODS_SEMANA_UNIFICADO = """
+            <div class="day-section">
+                <div class="day-header">
+                    Sin WODs disponibles
+                </div>
+                <div class="no-wod">
+                    No se encontraron WODs para esta semana
+                </div>
+            </div>
+            """
+
+
+# Correo de N8: cabecera con estilos, tarjetas de WOD y pie de página
+PLANTILLA_CORREO_N8 = compilar_plantilla("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <title>WODs de la semana</title>
+            <style>
+                @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;700&display=swap');
+                
+                body {{
+                    font-family: 'Roboto', Helvetica, Arial, sans-serif;
+                    line-height: 1.6;
+                    color: #333;
+                    max-width: 800px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    background-color: #f5f7fa;
+                }}
+                
+                h1 {{
+                    color: #2c3e50;
+                    font-size: 28px;
+                    text-align: center;
+                    font-weight: 700;
+                    margin-bottom: 30px;
+                }}
+                
+                h2 {{
+                    margin: 0;
+                    padding: 15px 20px;
+                    color: white;
+                    font-size: 18px;
+                    font-weight: 600;
+                    background-color: #2980b9;
+                    border-radius: 8px 8px 0 0;
+                    letter-spacing: 0.5px;
+                }}
+                
+                .wod-card {{
+                    background-color: white;
+                    border-radius: 8px;
+                    box-shadow: 0 4px 6px rgba(0,0,0,0.08);
+                    margin-bottom: 30px;
+                    overflow: hidden;
+                }}
+                
+                .wod-content {{
+                    padding: 25px;
+                }}
+                
+                .section-header {{
+                    font-weight: 700;
+                    font-size: 16px;
+                    color: #2c3e50;
+                    background-color: #ecf0f1;
+                    padding: 8px 12px;
+                    margin: 15px 0 10px 0;
+                    border-radius: 4px;
+                    border-left: 4px solid #3498db;
+                }}
+                
+                .workout-type {{
+                    font-weight: 700;
+                    font-size: 15px;
+                    color: white;
+                    background-color: #e74c3c;
+                    padding: 6px 10px;
+                    margin: 12px 0 8px 15px;
+                    border-radius: 3px;
+                    display: inline-block;
+                }}
+                
+                .workout-details {{
+                    margin: 5px 0 5px 25px;
+                    color: #34495e;
+                    font-weight: 500;
+                    font-size: 15px;
+                }}
+                
+                .subsection {{
+                    margin: 8px 0 8px 20px;
+                    color: #34495e;
+                    font-weight: 500;
+                }}
+                
+                .wod-list {{
+                    list-style-type: none;
+                    padding-left: 10px;
+                    margin: 10px 0 15px 15px;
+                }}
+                
+                .wod-list li {{
+                    position: relative;
+                    padding-left: 20px;
+                    margin-bottom: 8px;
+                    color: #34495e;
+                }}
+                
+                .wod-list li:before {{
+                    content: "•";
+                    position: absolute;
+                    left: 0;
+                    color: #3498db;
+                    font-weight: bold;
+                }}
+                
+                .wod-paragraph {{
+                    margin: 10px 0;
+                    color: #34495e;
+                }}
+                
+                .footer {{
+                    text-align: center;
+                    margin-top: 40px;
+                    font-size: 13px;
+                    color: #7f8c8d;
+                }}
+                
+                .logo {{
+                    text-align: center;
+                    margin-bottom: 20px;
+                }}
+                
+                .logo span {{
+                    font-size: 18px;
+                    font-weight: 700;
+                    color: #2980b9;
+                    letter-spacing: 2px;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="logo">
+                <span>WOD SCRAPER</span>
+            </div>
+            <h1>WODs de la semana ({lunes_fmt} - {viernes_fmt})</h1>
+        {contenido}
+            <div class="footer">
+                <p>Generado automáticamente — WOD Scraper 2.1</p>
+            </div>
+        </body>
+        </html>
+        """)
+
+PLANTILLA_TARJETA_N8 = compilar_plantilla('<div class="wod-card">\n<h2>WOD DEL {titulo}</h2>\n<div class="wod-content">{contenido}</div>\n</div>')
+SIN_WODS_N8 = '<div class="wod-card">\n<h2>Sin WODs disponibles</h2>\n<div class="wod-content"><p>No se encontraron WODs para esta semana.</p></div>\n</div>'
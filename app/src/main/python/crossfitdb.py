@@ -1,18 +1,21 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 from datetime import datetime, timedelta
 import re
-from bs4 import BeautifulSoup
-import argparse  # Para procesar argumentos de línea de comandos
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+import hashlib
+import asyncio
+import threading
+from html_texto import html_a_texto, SUSTITUCIONES_CROSSFITDB
+from json_rapido import json_respuesta
+from documento_wod import parsear_documento, renderizar_html_crossfitdb
 
 # Importar configuración desde archivo externo
 try:
-    from config import CROSSFITDB_CONFIG, EMAIL_CONFIG
+    from config import CROSSFITDB_CONFIG, EMAIL_CONFIG, leer_cache, escribir_cache
     print("Configuración de CrossFitDB y correo cargada correctamente")
 except ImportError:
     print("ERROR: No se encuentra el archivo config.py")
@@ -20,6 +23,225 @@ except ImportError:
     print("Consulta el README para más información")
     sys.exit(1)
 
+# Cabeceras de la WebView de Android que usa la app oficial de CrossFitDB
+HEADERS_NUBAPP = {
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Language": "es-ES,es;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Connection": "keep-alive",
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Origin": "http://localhost/",
+    "Referer": "http://localhost/",
+    "sec-ch-ua": '"Android WebView";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
+    "sec-ch-ua-mobile": "?1",
+    "sec-ch-ua-platform": "Android",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "cross-site",
+    "User-Agent": "Mozilla/5.0 (Linux; Android 7.1.2; SM-G988N Build/NRD90M; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/119.0.6045.193 Mobile Safari/537.36",
+    "X-Requested-With": "com.Nubapp.CrossFitDB"
+}
+
+# Timeout por defecto (conexión, lectura) en segundos para las peticiones a sport.nubapp.com
+TIMEOUT_NUBAPP = (5, 15)
+
+# Función para detectar si una respuesta indica token caducado o no válido
+def es_error_autenticacion(response):
+    """
+    Solo cuenta el código HTTP o los campos status/code del cuerpo: buscar palabras como
+    "token" o "login" en el mensaje daba falsos positivos que reautenticaban y repetían la petición.
+    """
+    if response.status_code in (401, 403):
+        return True
+    
+    # Las respuestas de error son pequeñas; no merece la pena decodificar las grandes
+    if len(response.content) > 2048:
+        return False
+    try:
+        datos = json_respuesta(response)
+    except ValueError:
+        return False
+    if not isinstance(datos, dict):
+        return False
+    return datos.get("status") in (401, 403, "401", "403") or datos.get("code") in (401, 403, "401", "403")
+
+class ClienteNubapp:
+    """
+    Cliente HTTP compartido para sport.nubapp.com.
+    Reutiliza las conexiones TCP/TLS (keep-alive) mediante un pool que crece con
+    asegurar_pool, aplica un timeout por defecto y envía siempre las cabeceras de la
+    WebView de Android.
+    Si se configura una función de reautenticación, las peticiones que fallan por
+    token caducado se repiten una vez con un token nuevo.
+    """
+    
+    def __init__(self, pool_maxsize=4, timeout=TIMEOUT_NUBAPP):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS_NUBAPP)
+        
+        # Un único host, así que basta un pool con tantas conexiones como peticiones simultáneas
+        self.pool_maxsize = pool_maxsize
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", self.adapter)
+        self._pool_lock = threading.Lock()
+        
+        self.token = None
+        self.reautenticar = None
+        self._token_lock = threading.Lock()
+    
+    def configurar_token(self, token, reautenticar=None):
+        """Fija el token vigente y la función que obtiene uno nuevo si caduca."""
+        self.token = token
+        self.reautenticar = reautenticar
+    
+    def asegurar_pool(self, pool_maxsize):
+        """
+        Amplía el pool si se van a lanzar más peticiones simultáneas que conexiones tiene;
+        si ya es suficiente no se toca. Se sustituye el pool manager del adaptador (no el
+        adaptador montado en la sesión) y se cierra el anterior: las peticiones en curso
+        terminan con su conexión, que se cierra al devolverla.
+        """
+        with self._pool_lock:
+            if pool_maxsize > self.pool_maxsize:
+                anterior = self.adapter.poolmanager
+                self.adapter.init_poolmanager(1, pool_maxsize)
+                self.pool_maxsize = pool_maxsize
+                anterior.clear()
+    
+    def post(self, url, data=None, **kwargs):
+        return self._peticion("POST", url, "data", data, **kwargs)
+    
+    def get(self, url, params=None, **kwargs):
+        return self._peticion("GET", url, "params", params, **kwargs)
+    
+    def cerrar(self):
+        self.session.close()
+    
+    def _peticion(self, metodo, url, campo, datos, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        
+        # Las peticiones que llevan token usan siempre el vigente
+        token_usado = None
+        if datos and "token" in datos and self.token is not None:
+            token_usado = self.token
+            datos = dict(datos, token=token_usado)
+        
+        kwargs[campo] = datos
+        response = self.session.request(metodo, url, **kwargs)
+        
+        if token_usado is not None and self.reautenticar and es_error_autenticacion(response):
+            nuevo_token = self._renovar_token(token_usado)
+            if nuevo_token:
+                kwargs[campo] = dict(datos, token=nuevo_token)
+                response = self.session.request(metodo, url, **kwargs)
+        return response
+    
+    def _renovar_token(self, token_caducado):
+        with self._token_lock:
+            # Otro hilo ya lo renovó mientras esperábamos
+            if self.token != token_caducado:
+                return self.token
+            self.token = self.reautenticar()
+            return self.token
+
+_cliente = None
+_cliente_lock = threading.Lock()
+
+# Función para obtener el cliente compartido (se crea en el primer uso)
+def obtener_cliente():
+    global _cliente
+    if _cliente is None:
+        with _cliente_lock:
+            if _cliente is None:
+                # Una conexión por día consultado en paralelo; al conocer las actividades
+                # candidatas de cada día el pool se amplía con asegurar_pool
+                pool_maxsize = max(1, CROSSFITDB_CONFIG.get("max_workers", 1))
+                _cliente = ClienteNubapp(pool_maxsize=pool_maxsize)
+    return _cliente
+
+# Nombre del archivo donde se guarda el token de sesión entre ejecuciones
+ARCHIVO_CACHE_TOKEN = "crossfitdb_token.json"
+
+# Función para leer el token guardado si sigue vigente
+def cargar_token_cache():
+    datos = leer_cache(ARCHIVO_CACHE_TOKEN)
+    if not datos:
+        return None
+    
+    # El token solo vale para el usuario con el que se obtuvo
+    if datos.get("username") != CROSSFITDB_CONFIG["username"]:
+        return None
+    if time.time() >= datos.get("expira", 0):
+        return None
+    return datos.get("token")
+
+# Función para guardar el token con su fecha de caducidad
+def guardar_token_cache(token):
+    escribir_cache(ARCHIVO_CACHE_TOKEN, {
+        "token": token,
+        "username": CROSSFITDB_CONFIG["username"],
+        "expira": time.time() + CROSSFITDB_CONFIG.get("token_ttl", 0)
+    })
+
+# Función para autenticarse en CrossFitDB y obtener un token nuevo
+def autenticar(log_func=print):
+    log_func("📡 Autenticando en CrossFitDB...")
+    url_auth = "https://sport.nubapp.com/api/v4/users/checkUser.php"
+    
+    payload_auth = {
+        "u": "ionic",
+        "p": "ed24ec82ce9631b5bcf4e06e3bdbe60d",
+        "app_version": "5.10.05",
+        "username": CROSSFITDB_CONFIG["username"],
+        "password": CROSSFITDB_CONFIG["password"],
+        "platform": "android",
+        "id_application": CROSSFITDB_CONFIG["id_application"]
+    }
+
+    response_auth = obtener_cliente().post(url_auth, data=payload_auth)
+    response_auth.raise_for_status()
+
+    # Verificar si la autenticación fue exitosa
+    response_data = json_respuesta(response_auth)
+    session_token = None
+    
+    # Buscar token en diferentes ubicaciones posibles
+    if "token" in response_data:
+        session_token = response_data["token"]
+    elif "data" in response_data and "token" in response_data["data"]:
+        session_token = response_data["data"]["token"]
+    elif "user" in response_data and "token" in response_data["user"]:
+        session_token = response_data["user"]["token"]
+    elif "user" in response_data and "id" in response_data["user"]:
+        session_token = response_data["user"]["id"]
+        log_func(f"⚠️ Usando ID de usuario como token: {session_token}")
+    
+    if not session_token:
+        log_func("❌ No se pudo encontrar token en la respuesta de autenticación")
+        return None
+    
+    guardar_token_cache(session_token)
+    log_func("✅ Autenticación CrossFitDB exitosa")
+    return session_token
+
+# Las funciones *_async envuelven con asyncio.to_thread las peticiones bloqueantes de requests:
+# no hay cliente HTTP asíncrono (httpx/aiohttp) en la lista pip de Chaquopy (app/build.gradle.kts).
+# Cada petición ocupa un hilo mientras dura, así que los días en paralelo los limita max_workers
+# (CFDB_MAX_WORKERS) y, por encima, el pool de hilos por defecto de asyncio.
+
+# Versión asíncrona de autenticar (checkUser.php) para usar desde el event loop
+async def autenticar_async(log_func=print):
+    return await asyncio.to_thread(autenticar, log_func)
+
+# Función para obtener un token: el guardado si sigue vigente o uno nuevo
+def obtener_token(log_func=print):
+    session_token = cargar_token_cache()
+    if session_token:
+        log_func("✅ Reutilizando token de CrossFitDB guardado")
+        return session_token
+    return autenticar(log_func)
+
 # Función para obtener la fecha en formato DD-MM-YYYY
 def formatear_fecha(fecha):
     return fecha.strftime("%d-%m-%Y")
@@ -48,21 +270,9 @@ def limpiar_html(texto):
     if not texto:
         return ""
     
-    # Reemplazar algunos tags HTML con sus equivalentes en texto plano
-    texto = texto.replace("<br>", "\n").replace("<br />", "\n").replace("<br/>", "\n")
-    texto = texto.replace("<p>", "").replace("</p>", "\n")
-    texto = texto.replace("<h1>", "").replace("</h1>", "\n")
-    texto = texto.replace("<h2>", "").replace("</h2>", "\n")
-    texto = texto.replace("<h3>", "").replace("</h3>", "\n")
-    
-    # Preservar listas pero sin añadir bullets
-    texto = texto.replace("<ul>", "").replace("</ul>", "")
-    texto = texto.replace("<ol>", "").replace("</ol>", "")
-    texto = texto.replace("<li>", "").replace("</li>", "\n")
-    
-    # Usar BeautifulSoup para eliminar cualquier otro tag HTML
-    soup = BeautifulSoup(texto, "html.parser")
-    texto_limpio = soup.get_text(separator=" ")
+    # Quitar el HTML cambiando saltos, párrafos, títulos y elementos de lista por saltos de línea
+    # (las listas se preservan pero sin añadir bullets)
+    texto_limpio = html_a_texto(texto, " ", SUSTITUCIONES_CROSSFITDB.get)
     
     # Eliminar bullets y guiones al inicio de cada línea, pero mantener letras con punto
     lineas = texto_limpio.split('\n')
@@ -214,11 +424,11 @@ def obtener_wod_whiteboard(id_wod, session_token):
     
     try:
         # Hacer la petición
-        response = requests.post(url_whiteboard, data=payload_whiteboard, headers=headers)
+        response = obtener_cliente().post(url_whiteboard, data=payload_whiteboard)
         response.raise_for_status()
         
         # Verificar la respuesta
-        whiteboard_data = response.json()
+        whiteboard_data = json_respuesta(response)
         
         html_content = None
         
@@ -309,10 +519,10 @@ def obtener_wod_whiteboard(id_wod, session_token):
             url_whiteboard_alt = "https://sport.nubapp.com/api/v4/activities/getWod.php"
             print(f"Intentando con URL alternativa: {url_whiteboard_alt}")
             
-            response = requests.post(url_whiteboard_alt, data=payload_whiteboard, headers=headers)
+            response = obtener_cliente().post(url_whiteboard_alt, data=payload_whiteboard)
             response.raise_for_status()
             
-            whiteboard_data = response.json()
+            whiteboard_data = json_respuesta(response)
             
             if "data" in whiteboard_data and "description" in whiteboard_data["data"]:
                 print("✅ Se encontró contenido en la URL alternativa")
@@ -332,11 +542,12 @@ def formatear_wod_texto(texto):
     texto_formateado = aplicar_formato(texto_limpio)
     return texto_formateado
 
-# Función para obtener un WOD para una fecha específica
-def obtener_wod_para_fecha(fecha, session_token, exportar_html=False, log_func=print):
-    fecha_formateada = formatear_fecha(fecha)
-    log_func(f"\nConsultando actividades para la fecha: {fecha_formateada}")
-    
+# Campos y formatos en los que el calendario puede indicar la fecha de una actividad
+CAMPOS_FECHA_ACTIVIDAD = ["start_timestamp", "start_date", "date", "start"]
+FORMATOS_FECHA_ACTIVIDAD = ["%d-%m-%Y", "%Y-%m-%d", "%d/%m/%Y"]
+
+# Función para consultar las actividades del calendario entre dos fechas (ambas incluidas)
+def obtener_actividades_calendario(inicio, fin, session_token):
     url_calendar = "https://sport.nubapp.com/api/v4/activities/getActivitiesCalendar.php"
     
     payload_calendar = {
@@ -345,133 +556,307 @@ def obtener_wod_para_fecha(fecha, session_token, exportar_html=False, log_func=p
         "app_version": "5.10.05",
         "id_application": CROSSFITDB_CONFIG["id_application"],
         "id_user": CROSSFITDB_CONFIG["id_user"],
-        "start_timestamp": fecha_formateada,
-        "end_timestamp": fecha_formateada,
+        "start_timestamp": formatear_fecha(inicio),
+        "end_timestamp": formatear_fecha(fin),
         "id_category_activit": "111",
         "token": session_token
     }
     
+    response_calendar = obtener_cliente().post(url_calendar, data=payload_calendar)
+    response_calendar.raise_for_status()
+    calendar_data = json_respuesta(response_calendar)
+    
+    if "data" in calendar_data and "activities_calendar" in calendar_data["data"]:
+        return calendar_data["data"]["activities_calendar"]
+    return None
+
+# Función para obtener la fecha (date) de una actividad del calendario
+def obtener_fecha_actividad(activity):
+    for campo in CAMPOS_FECHA_ACTIVIDAD:
+        valor = activity.get(campo)
+        if not valor:
+            continue
+        
+        # Timestamps numéricos (segundos desde epoch)
+        if isinstance(valor, (int, float)) or str(valor).isdigit():
+            try:
+                return datetime.fromtimestamp(int(valor)).date()
+            except (ValueError, OverflowError, OSError):
+                continue
+        
+        texto = str(valor).strip()[:10]
+        for formato in FORMATOS_FECHA_ACTIVIDAD:
+            try:
+                return datetime.strptime(texto, formato).date()
+            except ValueError:
+                continue
+    return None
+
+# Función para agrupar las actividades del calendario por fecha
+def agrupar_actividades_por_fecha(activities):
+    """
+    Agrupa las actividades por fecha.
+    Devuelve None si alguna actividad no tiene una fecha reconocible.
+    """
+    actividades_por_fecha = {}
+    for activity in activities:
+        fecha = obtener_fecha_actividad(activity)
+        if fecha is None:
+            return None
+        actividades_por_fecha.setdefault(fecha, []).append(activity)
+    return actividades_por_fecha
+
+# Función para obtener las actividades de toda la semana con una sola consulta
+def obtener_actividades_semana(inicio, fin, session_token, log_func=print):
+    """
+    Consulta el calendario una sola vez para todo el rango y agrupa las actividades por fecha.
+    Devuelve None si no se puede usar el modo por rango (se consultará día a día).
+    """
+    log_func(f"\nConsultando actividades del {formatear_fecha(inicio)} al {formatear_fecha(fin)}")
+    try:
+        activities = obtener_actividades_calendario(inicio, fin, session_token)
+    except Exception as e:
+        log_func(f"⚠️ Error al consultar el calendario de la semana: {e}")
+        return None
+    
+    if activities is None:
+        log_func("⚠️ El calendario de la semana no devolvió actividades, se consultará día a día")
+        return None
+    
+    actividades_por_fecha = agrupar_actividades_por_fecha(activities)
+    if actividades_por_fecha is None:
+        log_func("⚠️ Hay actividades sin fecha reconocible, se consultará día a día")
+        return None
+    
+    log_func(f"✅ {len(activities)} actividades en {len(actividades_por_fecha)} días")
+    return actividades_por_fecha
+
+# Función para extraer la descripción del WOD de una respuesta del planner
+def extraer_descripcion_planner(planner_data):
+    if "data" in planner_data and "workouts" in planner_data["data"]:
+        workouts = planner_data["data"]["workouts"]
+        if workouts and len(workouts) > 0:
+            # Tomar el primer workout
+            workout = workouts[0]
+            if "description" in workout and workout["description"]:
+                return workout["description"]
+    return ""
+
+# Función para obtener la descripción del planner con caché en disco y revalidación condicional
+def obtener_descripcion_planner(id_activity_program_day, url_planner, params_planner, log_func=print):
+    """
+    Devuelve la descripción del WOD publicada en el planner para id_activity_program_day.
+    - Si el servidor envió ETag/Last-Modified, se revalida con una petición condicional
+      y un 304 reutiliza la descripción guardada.
+    - Si no envió validadores, la descripción se reutiliza sin petición durante planner_ttl
+      segundos; después solo se vuelve a decodificar si cambia el hash del cuerpo.
+    """
+    nombre_cache = os.path.join("planner", f"{id_activity_program_day}.json")
+    entrada = leer_cache(nombre_cache)
+    ahora = time.time()
+    
+    headers_condicionales = {}
+    if entrada:
+        if entrada.get("etag"):
+            headers_condicionales["If-None-Match"] = entrada["etag"]
+        if entrada.get("last_modified"):
+            headers_condicionales["If-Modified-Since"] = entrada["last_modified"]
+        
+        if not headers_condicionales and ahora - entrada.get("guardado", 0) < CROSSFITDB_CONFIG.get("planner_ttl", 0):
+            log_func(f"✅ Planner {id_activity_program_day} servido desde caché")
+            return entrada.get("descripcion", "")
+    
+    response_planner = obtener_cliente().get(url_planner, params=params_planner, headers=headers_condicionales)
+    
+    if response_planner.status_code == 304 and entrada:
+        log_func(f"✅ Planner {id_activity_program_day} sin cambios (304)")
+        entrada["guardado"] = ahora
+        escribir_cache(nombre_cache, entrada)
+        return entrada.get("descripcion", "")
+    
+    response_planner.raise_for_status()
+    
+    # Si el cuerpo no ha cambiado no hace falta decodificarlo otra vez
+    hash_cuerpo = hashlib.sha256(response_planner.content).hexdigest()
+    if entrada and entrada.get("hash") == hash_cuerpo:
+        wod_descripcion = entrada.get("descripcion", "")
+    else:
+        wod_descripcion = extraer_descripcion_planner(json_respuesta(response_planner))
+    
+    escribir_cache(nombre_cache, {
+        "etag": response_planner.headers.get("ETag"),
+        "last_modified": response_planner.headers.get("Last-Modified"),
+        "hash": hash_cuerpo,
+        "guardado": ahora,
+        "descripcion": wod_descripcion
+    })
+    return wod_descripcion
+
+# Función para obtener el id_activity_program_day de una actividad del calendario
+def obtener_id_program_day(id_activity_calendar, session_token):
+    url_wod_details = "https://sport.nubapp.com/api/v4/activities/getUserActivityCalendar.php"
+    
+    payload_wod_details = {
+        "u": "ionic",
+        "p": "ed24ec82ce9631b5bcf4e06e3bdbe60d",
+        "app_version": "5.10.05",
+        "id_application": CROSSFITDB_CONFIG["id_application"],
+        "id_user": CROSSFITDB_CONFIG["id_user"],
+        "id_activity_calendar": id_activity_calendar,
+        "token": session_token
+    }
+    
+    response_wod = obtener_cliente().post(url_wod_details, data=payload_wod_details)
+    response_wod.raise_for_status()
+    wod_data = json_respuesta(response_wod)
+    
+    if "data" in wod_data and "activity_calendar" in wod_data["data"]:
+        return wod_data["data"]["activity_calendar"].get("id_activity_program_day")
+    return None
+
+# Función para construir el WOD de un día a partir de la descripción del planner
+def construir_wod(fecha, wod_descripcion, id_activity_calendar):
+    dias_semana = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+    wod_dia_semana = dias_semana[fecha.weekday()]
+    fecha_str = fecha.strftime("%d/%m/%Y")
+    
+    # Limpiar y formatear
+    wod_descripcion_formateada = formatear_wod_texto(wod_descripcion)
+    
+    # Construir el WOD
+    wod_completo = f"WOD DEL {wod_dia_semana} {fecha_str}\n"
+    wod_completo += "=" * 40 + "\n"
+    wod_completo += wod_descripcion_formateada
+    
+    return {
+        "fecha": fecha,
+        "dia_semana": wod_dia_semana,
+        "fecha_formateada": fecha_str,
+        "contenido": wod_descripcion_formateada,
+        "texto_completo": wod_completo,
+        "id_wod": id_activity_calendar,
+        "valor_orden": fecha.weekday() + 1
+    }
+
+# Función asíncrona para resolver el WOD de una actividad (getUserActivityCalendar + planner)
+async def procesar_actividad_async(fecha, activity, tipo_actividad, session_token, log_func=print):
+    id_activity_calendar = activity.get("id_activity_calendar")
+    log_func(f"Procesando actividad {tipo_actividad}: {id_activity_calendar}")
+    
     try:
-        response_calendar = requests.post(url_calendar, data=payload_calendar, headers=headers)
-        response_calendar.raise_for_status()
-        calendar_data = response_calendar.json()
+        # Primero obtener getUserActivityCalendar para conseguir id_activity_program_day
+        id_activity_program_day = await asyncio.to_thread(obtener_id_program_day, id_activity_calendar, session_token)
+        
+        if not id_activity_program_day:
+            log_func(f"⚠️ No se encontró id_activity_program_day en actividad {id_activity_calendar}")
+            return None
         
-        if "data" in calendar_data and "activities_calendar" in calendar_data["data"]:
-            activities = calendar_data["data"]["activities_calendar"]
+        # Ahora usar el endpoint correcto para obtener el WOD
+        url_planner = f"https://sport.nubapp.com/api/v4/planner/programs/activities/days/{id_activity_program_day}"
+        
+        params_planner = {
+            "u": "ionic",
+            "p": "ed24ec82ce9631b5bcf4e06e3bdbe60d",
+            "app_version": "5.10.05",
+            "id_activity_calendar": id_activity_calendar,
+            "token": session_token
+        }
+        
+        wod_descripcion = await asyncio.to_thread(obtener_descripcion_planner, id_activity_program_day, url_planner, params_planner, log_func)
+        if wod_descripcion:
+            log_func(f"✅ Descripción encontrada en workout.description")
+        
+        if wod_descripcion and wod_descripcion.strip():
+            wod = construir_wod(fecha, wod_descripcion, id_activity_calendar)
+            log_func(f"✅ WOD encontrado en actividad {tipo_actividad} para {wod['dia_semana']}")
+            return wod
+        else:
+            log_func(f"⚠️ No se encontró descripción en actividad {tipo_actividad} {id_activity_calendar}")
+            return None
             
+    except Exception as e:
+        log_func(f"⚠️ Error procesando actividad {tipo_actividad} {id_activity_calendar}: {e}")
+        raise
+
+# Función para reunir las actividades candidatas de un día en orden de prioridad
+def candidatas_del_dia(activities):
+    """Primero las de "WORKOUT OF THE DAY" y como FALLBACK las de "CrossFit"."""
+    candidatas = [(activity, "WORKOUT OF THE DAY") for activity in activities if activity.get("name_activity") == "WORKOUT OF THE DAY"]
+    candidatas += [(activity, "CrossFit") for activity in activities if activity.get("name_activity") == "CrossFit"]
+    return candidatas
+
+# Función asíncrona para resolver en paralelo las actividades candidatas de un día
+async def resolver_candidatas_async(fecha, candidatas, session_token, log_func=print):
+    """
+    Lanza todas las candidatas a la vez (id_activity_program_day + planner de cada una) y
+    acepta la primera con descripción respetando la prioridad: una candidata solo gana
+    cuando todas las anteriores han salido vacías. En cuanto hay ganadora se cancelan las
+    de menor prioridad que siguen pendientes. Si ninguna tiene WOD y alguna ha fallado se
+    relanza el error: el día no se puede dar por consultado.
+    """
+    tareas = [
+        asyncio.create_task(procesar_actividad_async(fecha, activity, tipo_actividad, session_token, log_func))
+        for activity, tipo_actividad in candidatas
+    ]
+    primera_crossfit = next((i for i, (_, tipo) in enumerate(candidatas) if tipo == "CrossFit"), None)
+    error = None
+    try:
+        for i, tarea in enumerate(tareas):
+            if i == primera_crossfit and i > 0:
+                log_func("⚠️ No se encontró WOD en 'WORKOUT OF THE DAY', intentando con actividades 'CrossFit'...")
+            try:
+                resultado = await tarea
+            except Exception as e:
+                error = e
+                continue
+            if resultado:
+                return resultado
+        if error is not None:
+            raise error
+        return None
+    finally:
+        # Una tarea cancelada mientras espera su hilo no llega a pedir el planner
+        pendientes = [tarea for tarea in tareas if not tarea.done()]
+        for tarea in pendientes:
+            tarea.cancel()
+        if pendientes:
+            await asyncio.gather(*pendientes, return_exceptions=True)
+
+# Función asíncrona para obtener un WOD para una fecha específica
+async def obtener_wod_para_fecha_async(fecha, session_token, log_func=print, actividades=None, fechas_fallidas=None, dias_en_paralelo=1):
+    """
+    Obtiene el WOD de una fecha. Si se pasan las actividades del día (modo por rango)
+    no se vuelve a consultar el calendario. Devuelve None tanto si no hay WOD como si
+    falla la consulta; en el segundo caso el día se añade a fechas_fallidas (un set).
+    dias_en_paralelo indica cuántos días se consultan a la vez para dimensionar el pool
+    cuando las candidatas no se conocían de antemano (modo día a día).
+    """
+    fecha_formateada = formatear_fecha(fecha)
+    
+    try:
+        if actividades is None:
+            log_func(f"\nConsultando actividades para la fecha: {fecha_formateada}")
+            activities = await asyncio.to_thread(obtener_actividades_calendario, fecha, fecha, session_token)
+        else:
+            log_func(f"\nResolviendo WOD para la fecha: {fecha_formateada}")
+            activities = actividades
+        
+        if activities is not None:
             # Buscar primero en "WORKOUT OF THE DAY", luego en "CrossFit"
-            workout_activities = [activity for activity in activities if activity.get("name_activity") == "WORKOUT OF THE DAY"]
-            crossfit_activities = [activity for activity in activities if activity.get("name_activity") == "CrossFit"]
-            
-            log_func(f"Actividades 'WORKOUT OF THE DAY' encontradas: {len(workout_activities)}")
-            log_func(f"Actividades 'CrossFit' encontradas: {len(crossfit_activities)}")
-            
-            # Función auxiliar para procesar cualquier tipo de actividad
-            def procesar_actividad(activity, tipo_actividad):
-                id_activity_calendar = activity.get("id_activity_calendar")
-                log_func(f"Procesando actividad {tipo_actividad}: {id_activity_calendar}")
-                
-                # Primero obtener getUserActivityCalendar para conseguir id_activity_program_day
-                url_wod_details = "https://sport.nubapp.com/api/v4/activities/getUserActivityCalendar.php"
-                
-                payload_wod_details = {
-                    "u": "ionic",
-                    "p": "ed24ec82ce9631b5bcf4e06e3bdbe60d",
-                    "app_version": "5.10.05",
-                    "id_application": CROSSFITDB_CONFIG["id_application"],
-                    "id_user": CROSSFITDB_CONFIG["id_user"],
-                    "id_activity_calendar": id_activity_calendar,
-                    "token": session_token
-                }
-                
-                try:
-                    response_wod = requests.post(url_wod_details, data=payload_wod_details, headers=headers)
-                    response_wod.raise_for_status()
-                    wod_data = response_wod.json()
-                    
-                    # Obtener id_activity_program_day
-                    id_activity_program_day = None
-                    if "data" in wod_data and "activity_calendar" in wod_data["data"]:
-                        id_activity_program_day = wod_data["data"]["activity_calendar"].get("id_activity_program_day")
-                    
-                    if not id_activity_program_day:
-                        log_func(f"⚠️ No se encontró id_activity_program_day en actividad {id_activity_calendar}")
-                        return None
-                    
-                    # Ahora usar el endpoint correcto para obtener el WOD
-                    url_planner = f"https://sport.nubapp.com/api/v4/planner/programs/activities/days/{id_activity_program_day}"
-                    
-                    params_planner = {
-                        "u": "ionic",
-                        "p": "ed24ec82ce9631b5bcf4e06e3bdbe60d",
-                        "app_version": "5.10.05",
-                        "id_activity_calendar": id_activity_calendar,
-                        "token": session_token
-                    }
-                    
-                    response_planner = requests.get(url_planner, params=params_planner, headers=headers)
-                    response_planner.raise_for_status()
-                    planner_data = response_planner.json()
-                    
-                    # Extraer la descripción del WOD
-                    wod_descripcion = ""
-                    if "data" in planner_data and "workouts" in planner_data["data"]:
-                        workouts = planner_data["data"]["workouts"]
-                        if workouts and len(workouts) > 0:
-                            # Tomar el primer workout
-                            workout = workouts[0]
-                            if "description" in workout and workout["description"]:
-                                wod_descripcion = workout["description"]
-                                log_func(f"✅ Descripción encontrada en workout.description")
-                    
-                    if wod_descripcion and wod_descripcion.strip():
-                        # Formatear el WOD
-                        dias_semana = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-                        wod_dia_semana = dias_semana[fecha.weekday()]
-                        fecha_str = fecha.strftime("%d/%m/%Y")
-                        
-                        # Limpiar y formatear
-                        wod_descripcion_formateada = formatear_wod_texto(wod_descripcion)
-                        
-                        # Construir el WOD
-                        wod_completo = f"WOD DEL {wod_dia_semana} {fecha_str}\n"
-                        wod_completo += "=" * 40 + "\n"
-                        wod_completo += wod_descripcion_formateada
-                        
-                        log_func(f"✅ WOD encontrado en actividad {tipo_actividad} para {wod_dia_semana}")
-                        
-                        return {
-                            "fecha": fecha,
-                            "dia_semana": wod_dia_semana,
-                            "fecha_formateada": fecha_str,
-                            "contenido": wod_descripcion_formateada,
-                            "texto_completo": wod_completo,
-                            "id_wod": id_activity_calendar,
-                            "valor_orden": fecha.weekday() + 1
-                        }
-                    else:
-                        log_func(f"⚠️ No se encontró descripción en actividad {tipo_actividad} {id_activity_calendar}")
-                        return None
-                        
-                except Exception as e:
-                    log_func(f"⚠️ Error procesando actividad {tipo_actividad} {id_activity_calendar}: {e}")
-                    return None
+            candidatas = candidatas_del_dia(activities)
+            total_workout = sum(1 for _, tipo in candidatas if tipo == "WORKOUT OF THE DAY")
             
-            # Intentar primero con actividades "WORKOUT OF THE DAY"
-            if workout_activities:
-                for workout_activity in workout_activities:
-                    resultado = procesar_actividad(workout_activity, "WORKOUT OF THE DAY")
-                    if resultado:
-                        return resultado
+            log_func(f"Actividades 'WORKOUT OF THE DAY' encontradas: {total_workout}")
+            log_func(f"Actividades 'CrossFit' encontradas: {len(candidatas) - total_workout}")
             
-            # FALLBACK: Si no WOD encontrado en "WORKOUT OF THE DAY", intentar con "CrossFit"
-            if crossfit_activities:
-                log_func("⚠️ No se encontró WOD en 'WORKOUT OF THE DAY', intentando con actividades 'CrossFit'...")
-                
-                for crossfit_activity in crossfit_activities:
-                    resultado = procesar_actividad(crossfit_activity, "CrossFit")
-                    if resultado:
-                        return resultado
+            if candidatas:
+                # En modo por rango el pool ya se dimensionó antes de empezar; día a día solo
+                # se reconstruye si este día tiene más candidatas que los anteriores
+                if actividades is None:
+                    obtener_cliente().asegurar_pool(dias_en_paralelo * len(candidatas))
+                resultado = await resolver_candidatas_async(fecha, candidatas, session_token, log_func)
+                if resultado:
+                    return resultado
             
             log_func("❌ No se encontraron actividades 'WORKOUT OF THE DAY' ni 'CrossFit'")
         else:
@@ -479,9 +864,54 @@ def obtener_wod_para_fecha(fecha, session_token, exportar_html=False, log_func=p
     
     except Exception as e:
         log_func(f"Error al obtener WOD para fecha {fecha_formateada}: {e}")
+        if fechas_fallidas is not None:
+            fechas_fallidas.add(fecha.date())
     
     return None
 
+# Función para obtener un WOD para una fecha específica
+def obtener_wod_para_fecha(fecha, session_token, exportar_html=False, log_func=print, actividades=None):
+    """Versión síncrona de obtener_wod_para_fecha_async."""
+    return asyncio.run(obtener_wod_para_fecha_async(fecha, session_token, log_func, actividades))
+
+# Función asíncrona para obtener los WODs de varias fechas con concurrencia limitada
+async def obtener_wods_para_fechas_async(fechas, session_token, max_workers=1, log_func=print, actividades_por_fecha=None, al_obtener=None, fechas_fallidas=None):
+    """
+    Consulta los WODs de varias fechas con un máximo de max_workers días en paralelo.
+    Si se pasan actividades_por_fecha (modo por rango) no se consulta el calendario de cada día.
+    El día de hoy se consulta el primero y al_obtener(wod) se llama con cada WOD en cuanto llega.
+    Los días cuya consulta falla se añaden a fechas_fallidas (un set) si se pasa.
+    Devuelve los WODs encontrados respetando el orden de las fechas recibidas.
+    """
+    dias_en_paralelo = max(1, max_workers)
+    semaforo = asyncio.Semaphore(dias_en_paralelo)
+    
+    # En modo por rango el pool se dimensiona antes de empezar, con el día de más candidatas
+    if actividades_por_fecha:
+        max_candidatas = max(len(candidatas_del_dia(actividades)) for actividades in actividades_por_fecha.values())
+        obtener_cliente().asegurar_pool(dias_en_paralelo * max(1, max_candidatas))
+    
+    async def consultar(fecha):
+        actividades = None
+        if actividades_por_fecha is not None:
+            actividades = actividades_por_fecha.get(fecha.date(), [])
+        async with semaforo:
+            wod = await obtener_wod_para_fecha_async(fecha, session_token, log_func, actividades, fechas_fallidas, dias_en_paralelo)
+        if wod and al_obtener:
+            al_obtener(wod)
+        return wod
+    
+    # Las tareas toman el semáforo en el orden en que se crean: hoy primero, el resto como venían
+    hoy = datetime.now().date()
+    orden = sorted(range(len(fechas)), key=lambda i: fechas[i].date() != hoy)
+    resultados = await asyncio.gather(*(consultar(fechas[i]) for i in orden))
+    por_posicion = dict(zip(orden, resultados))
+    return [por_posicion[i] for i in range(len(fechas)) if por_posicion[i]]
+
+# Función para obtener los WODs de varias fechas (versión síncrona)
+def obtener_wods_para_fechas(fechas, session_token, max_workers=1, log_func=print, actividades_por_fecha=None, al_obtener=None, fechas_fallidas=None):
+    return asyncio.run(obtener_wods_para_fechas_async(fechas, session_token, max_workers, log_func, actividades_por_fecha, al_obtener, fechas_fallidas))
+
 # Función para detectar si una línea es un tipo de entrenamiento
 def es_tipo_entrenamiento(linea):
     """Helper function para detectar si una línea es un tipo de entrenamiento"""
@@ -503,53 +933,41 @@ def es_tipo_entrenamiento(linea):
 def formatear_wod_para_correo(contenido):
     if not contenido:
         return ""
-        
-    CATEGORIAS = {
-        "STRENGTH": ["STRENGTH"],
-        "METCON": ["METCON"],
-        "SKILL": ["SKILL", "SKILL GYMNASTICS", "GYMNASTICS"],
-        "SKILL OLYMPICS": ["SKILL OLYMPICS"],
-        "W/UP": ["W/UP", "WARM UP", "WARMUP"]
+    return renderizar_html_crossfitdb(parsear_documento(contenido))
+
+# Función para convertir un WOD al formato unificado que comparten N8 y CrossFitDB
+def formatear_wod_unificado(wod, incluir_html=True):
+    """Sin incluir_html se omite contenido_html (se puede generar después con formatear_wod_para_correo)."""
+    wod_unificado = {
+        "fecha": wod["fecha"],
+        "fecha_iso": wod["fecha"].strftime("%Y-%m-%d"),
+        "fecha_formateada": wod["fecha_formateada"],
+        "dia_semana": wod["dia_semana"],
+        "contenido": wod["contenido"]
     }
-    
-    lineas = contenido.split('\n')
-    resultado = []
-    categoria_actual = None
-    
-    # Saltamos la primera línea si contiene "Crossfit"
-    if lineas and "crossfit" in lineas[0].lower():
-        lineas = lineas[1:]
-        
-    for linea in lineas:
-        linea = linea.strip()
-        if not linea:
-            continue
-            
-        linea_upper = linea.upper()
-        es_categoria = False
-        
-        # Verificar si la línea es una categoría
-        for cat, variaciones in CATEGORIAS.items():
-            if any(var == linea_upper for var in variaciones):
-                es_categoria = True
-                categoria_actual = cat
-                # Formato para categorías: fondo gris claro y línea vertical azul delgada
-                resultado.append(f'<div style="color: #000000; font-weight: 700; background-color: #f5f5f5; padding: 8px 12px; margin: 10px 0; border-left: 2px solid #2980b9;">{linea_upper}</div>')
-                break
-                
-        if not es_categoria:
-            # Si no es categoría, es un ejercicio - mantener formato original
-            resultado.append(f'<div style="margin-left: 20px; padding: 5px 0; color: #34495e;">{linea}</div>')
-            
-    return '\n'.join(resultado)
+    if incluir_html:
+        wod_unificado["contenido_html"] = formatear_wod_para_correo(wod["contenido"])
+    wod_unificado.update({
+        "valor_orden": wod["valor_orden"],
+        "gimnasio": "CrossFitDB",
+        "titulo": f"WOD DEL {wod['dia_semana']} {wod['fecha_formateada']}",
+        "id_wod": wod.get("id_wod", "")
+    })
+    return wod_unificado
 
-def main(semana=True, include_weekends=False, log_func=print):
+async def main_async(semana=True, include_weekends=False, log_func=print, max_workers=None, rango_semanal=True, fechas=None, on_wod=None, incluir_html=True, fechas_fallidas=None):
     """
-    Función principal que obtiene los WODs de CrossFit DB
+    Versión asíncrona de main. Puede ejecutarse en el mismo event loop que otros scrapers.
     :param semana: Si se deben obtener los WODs de toda la semana
     :param include_weekends: Si se deben incluir los fines de semana
     :param log_func: Función para loguear mensajes.
-    :return: Lista de WODs formateados o None en caso de error
+    :param max_workers: Días consultados en paralelo (por defecto CFDB_MAX_WORKERS, 1 = secuencial)
+    :param rango_semanal: Si se consulta el calendario de toda la semana en una sola petición
+    :param fechas: Lista de fechas (datetime) concretas a consultar en lugar de toda la semana
+    :param on_wod: Función a la que se pasa cada WOD formateado en cuanto se obtiene (el de hoy primero)
+    :param incluir_html: Si se genera contenido_html (si no, se omite; ver formatear_wod_para_correo)
+    :param fechas_fallidas: Set al que se añaden los días cuya consulta ha fallado
+    :return: Lista de WODs formateados (vacía si no hay ninguno) o None en caso de error
     """
     try:
         log_func("Iniciando script CrossFitDB...")
@@ -559,112 +977,63 @@ def main(semana=True, include_weekends=False, log_func=print):
             log_func("❌ Error: Configuración incompleta")
             return None
 
-        # Configurar headers globales
-        global headers
-        headers = {
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Accept-Language": "es-ES,es;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Connection": "keep-alive",
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Origin": "http://localhost/",
-            "Referer": "http://localhost/",
-            "sec-ch-ua": '"Android WebView";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
-            "sec-ch-ua-mobile": "?1",
-            "sec-ch-ua-platform": "Android",
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "cross-site",
-            "User-Agent": "Mozilla/5.0 (Linux; Android 7.1.2; SM-G988N Build/NRD90M; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/119.0.6045.193 Mobile Safari/537.36",
-            "X-Requested-With": "com.Nubapp.CrossFitDB"
-        }
-        
-        # 1. AUTENTICARSE Y OBTENER TOKEN
-        log_func("📡 Autenticando en CrossFitDB...")
-        url_auth = "https://sport.nubapp.com/api/v4/users/checkUser.php"
-        
-        payload_auth = {
-            "u": "ionic",
-            "p": "ed24ec82ce9631b5bcf4e06e3bdbe60d",
-            "app_version": "5.10.05",
-            "username": CROSSFITDB_CONFIG["username"],
-            "password": CROSSFITDB_CONFIG["password"],
-            "platform": "android",
-            "id_application": CROSSFITDB_CONFIG["id_application"]
-        }
-
-        response_auth = requests.post(url_auth, data=payload_auth, headers=headers)
-        response_auth.raise_for_status()
-
-        # Verificar si la autenticación fue exitosa
-        response_data = response_auth.json()
-        session_token = None
-        
-        # Buscar token en diferentes ubicaciones posibles
-        if "token" in response_data:
-            session_token = response_data["token"]
-        elif "data" in response_data and "token" in response_data["data"]:
-            session_token = response_data["data"]["token"]
-        elif "user" in response_data and "token" in response_data["user"]:
-            session_token = response_data["user"]["token"]
-        elif "user" in response_data and "id" in response_data["user"]:
-            session_token = response_data["user"]["id"]
-            log_func(f"⚠️ Usando ID de usuario como token: {session_token}")
-        
+        # 1. OBTENER TOKEN (guardado en caché o autenticándose de nuevo)
+        session_token = await asyncio.to_thread(obtener_token, log_func)
         if not session_token:
-            log_func("❌ No se pudo encontrar token en la respuesta de autenticación")
             return None
-            
-        log_func("✅ Autenticación CrossFitDB exitosa")
+        
+        # Si el token caduca durante la sincronización, el cliente se reautentica solo
+        obtener_cliente().configurar_token(session_token, lambda: autenticar(log_func))
 
-        # 2. OBTENER WODS
-        wods_encontrados = []
+        # 2. OBTENER WODS (cada uno se formatea según llega)
+        wods_formateados = []
+        
+        def al_obtener(wod):
+            wod_formateado = formatear_wod_unificado(wod, incluir_html)
+            wods_formateados.append(wod_formateado)
+            if on_wod:
+                on_wod(wod_formateado)
         
-        if semana:
+        if fechas is not None:
+            # Solo los días pedidos (sincronización incremental)
+            fechas = sorted(fechas)
+            log_func(f"🗓️ Buscando WODs de {len(fechas)} días pendientes")
+        elif semana:
             # Obtener el rango de la semana actual
             inicio, fin = obtener_rango_semana_actual()
             
             log_func(f"🗓️ Buscando WODs de {inicio.strftime('%d/%m/%Y')} al {fin.strftime('%d/%m/%Y')}")
             
-            # Obtener WODs para cada día
+            # Reunir los días a consultar
+            fechas = []
             fecha_actual = inicio
             while fecha_actual <= fin:
                 # Verificar si es fin de semana cuando no están incluidos
-                if not include_weekends and fecha_actual.weekday() >= 5:
-                    fecha_actual += timedelta(days=1)
-                    continue
-                    
-                wod = obtener_wod_para_fecha(fecha_actual, session_token, log_func=log_func)
-                if wod:
-                    wods_encontrados.append(wod)
+                if include_weekends or fecha_actual.weekday() < 5:
+                    fechas.append(fecha_actual)
                 fecha_actual += timedelta(days=1)
         
-        # 3. FORMATEAR RESULTADOS
-        if wods_encontrados:
-            # Ordenar los WODs por día de la semana
-            wods_encontrados.sort(key=lambda x: x["valor_orden"])
+        if fechas:
+            # Consultar el calendario de todos los días de una vez
+            actividades_por_fecha = None
+            if rango_semanal:
+                actividades_por_fecha = await asyncio.to_thread(obtener_actividades_semana, fechas[0], fechas[-1], session_token, log_func)
             
-            # Convertir a formato unificado
-            wods_formateados = []
-            for wod in wods_encontrados:
-                wods_formateados.append({
-                    "fecha": wod["fecha"],
-                    "fecha_iso": wod["fecha"].strftime("%Y-%m-%d"),
-                    "fecha_formateada": wod["fecha_formateada"],
-                    "dia_semana": wod["dia_semana"],
-                    "contenido": wod["contenido"],
-                    "contenido_html": formatear_wod_para_correo(wod["contenido"]),
-                    "valor_orden": wod["valor_orden"],
-                    "gimnasio": "CrossFitDB",
-                    "titulo": f"WOD DEL {wod['dia_semana']} {wod['fecha_formateada']}",
-                    "id_wod": wod.get("id_wod", "")
-                })
+            # Obtener WODs para cada día en paralelo
+            if max_workers is None:
+                max_workers = CROSSFITDB_CONFIG.get("max_workers", 1)
+            await obtener_wods_para_fechas_async(fechas, session_token, max_workers, log_func, actividades_por_fecha, al_obtener, fechas_fallidas)
+        
+        # 3. ORDENAR RESULTADOS
+        if wods_formateados:
+            # Ordenar los WODs por día de la semana (llegan en el orden en que se resuelven)
+            wods_formateados.sort(key=lambda x: (x["valor_orden"], x["fecha"]))
             
             log_func(f"\n✅ Se encontraron {len(wods_formateados)} WODs de CrossFitDB para esta semana:")
             return wods_formateados
         else:
             log_func("ℹ️ No se encontraron WODs de CrossFitDB para esta semana")
-            return None
+            return []
 
     except requests.exceptions.ConnectionError as e:
         log_func(f"❌ Error de conexión con CrossFitDB: {str(e)}")
@@ -673,5 +1042,21 @@ def main(semana=True, include_weekends=False, log_func=print):
         log_func(f"❌ Error general en CrossFitDB: {str(e)}")
         return None
 
+def main(semana=True, include_weekends=False, log_func=print, max_workers=None, rango_semanal=True, fechas=None, on_wod=None, incluir_html=True, fechas_fallidas=None):
+    """
+    Función principal que obtiene los WODs de CrossFit DB
+    :param semana: Si se deben obtener los WODs de toda la semana
+    :param include_weekends: Si se deben incluir los fines de semana
+    :param log_func: Función para loguear mensajes.
+    :param max_workers: Días consultados en paralelo (por defecto CFDB_MAX_WORKERS, 1 = secuencial)
+    :param rango_semanal: Si se consulta el calendario de toda la semana en una sola petición
+    :param fechas: Lista de fechas (datetime) concretas a consultar en lugar de toda la semana
+    :param on_wod: Función a la que se pasa cada WOD formateado en cuanto se obtiene (el de hoy primero)
+    :param incluir_html: Si se genera contenido_html (si no, se omite; ver formatear_wod_para_correo)
+    :param fechas_fallidas: Set al que se añaden los días cuya consulta ha fallado
+    :return: Lista de WODs formateados (vacía si no hay ninguno) o None en caso de error
+    """
+    return asyncio.run(main_async(semana, include_weekends, log_func, max_workers, rango_semanal, fechas, on_wod, incluir_html, fechas_fallidas))
+
 if __name__ == "__main__":
     main(include_weekends=True, log_func=print)
@@ -0,0 +1,264 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Modelo de documento de un WOD: el texto se divide en líneas y cada línea se clasifica
+# una sola vez (sección, categoría, tipo de entrenamiento, movimiento...). Los renderizados
+# de texto, HTML y JSON recorren esas líneas ya clasificadas en lugar de volver a aplicar
+# sus propias regex sobre el texto.
+
+# Lista de palabras que identifican un tipo de entrenamiento
+# y deben tratarse como subsecciones especiales
+TIPOS_ENTRENAMIENTO = [
+    "amrap",
+    "emom",
+    "tabata",
+    "for time",
+    "etabata"
+]
+
+# Lista expandida de tipos de entrenamiento que deben detectarse como categorías principales
+CATEGORIAS_PRINCIPALES = [
+    "EMOM", "AMRAP", "TABATA", "FOR TIME", "ETABATA", "STRENGTH", "METCON", "SKILL"
+]
+
+# Categorías de CrossFitDB (la línea tiene que ser exactamente una de las variaciones)
+CATEGORIAS_CROSSFITDB = {
+    "STRENGTH": ["STRENGTH"],
+    "METCON": ["METCON"],
+    "SKILL": ["SKILL", "SKILL GYMNASTICS", "GYMNASTICS"],
+    "SKILL OLYMPICS": ["SKILL OLYMPICS"],
+    "W/UP": ["W/UP", "WARM UP", "WARMUP"]
+}
+VARIACIONES_CROSSFITDB = frozenset(var for variaciones in CATEGORIAS_CROSSFITDB.values() for var in variaciones)
+
+# Categorías que se destacan en el correo cuando un WOD no trae HTML propio
+CATEGORIAS_CORREO = ("STRENGTH", "METCON", "EMOM", "AMRAP", "TABATA", "FOR TIME", "SKILL")
+
+# Títulos de sección de los WODs de N8 en el correo (se comparan con la línea en mayúsculas)
+REGEX_CATEGORIA_CORREO_N8 = re.compile(
+    r'^[A-Z]\)\s*(.*)'                  # A) cualquier cosa
+    r'|^[A-Z]\.\)\s*(.*)'               # A.) cualquier cosa
+    r'|^(?:EMOM|AMRAP)\s*\d+[\'"]?'     # EMOM/AMRAP seguido de números y opcional '/"
+    r'|^(?:TABATA|FOR TIME)'            # TABATA, FOR TIME exactos
+    r'|^.*\bSKILL\b.*'                  # Cualquier cosa con SKILL
+    r'|^STRETCH'                        # STRETCH exacto
+    r'|^ROPE CLIMB'                     # ROPE CLIMB
+    r'|^STRENGTH'                       # STRENGTH exacto
+    r'|(?i:^["\']?team\s+of\s+\d+["\']?)'  # Team of X con comillas opcionales
+)
+
+REGEX_TITULO = re.compile(r'^[A-Za-z0-9][\)\.]\s*')
+REGEX_SECCION = re.compile(r'^([A-Za-z])[)\.]\s*(.*)$')
+REGEX_CARRERA = re.compile(r'\d+\s*m\s+(?:run|syn)')
+REGEX_RONDAS = re.compile(r'^\d+\s+(?:rds|ygig)')
+REGEX_LISTA_NUMERADA = re.compile(r'^\d+[\.\)]')
+REGEX_MARCADOR_LISTA = re.compile(r'^(\s*)(•|-|\d+[\.\)])\s*')
+
+ESTILO_CATEGORIA = "color: #000000; font-weight: 700; background-color: #f5f5f5; padding: 8px 12px; margin: 10px 0; border-left: 2px solid #2980b9;"
+ESTILO_PARRAFO = "margin-left: 20px; padding: 5px 0; color: #34495e;"
+
+# Línea de un WOD con su clasificación
+LineaWod = namedtuple("LineaWod", [
+    "texto",                # Línea sin espacios al principio ni al final
+    "mayusculas",           # texto.upper()
+    "cabecera_wod",         # Empieza por "wod " (título con la fecha)
+    "titulo",               # Empieza por letra/número + paréntesis/punto
+    "equipo",               # "Team of X"
+    "carrera",              # Metros de run/syn
+    "rondas",               # Número + RDS/YGIG
+    "tipo_inicial",         # Empieza por un tipo de entrenamiento
+    "categoria",            # Categoría principal (EMOM, AMRAP, STRENGTH...)
+    "seccion",              # (letra, resto) de "A) ..." o None
+    "tipo_entrenamiento",   # Tipo de entrenamiento en mayúsculas o None
+    "item_lista",           # Texto sin el marcador de lista o None
+    "categoria_crossfitdb", # Categoría exacta de CrossFitDB
+    "categoria_correo",     # Categoría del correo para WODs sin HTML
+    "categoria_correo_n8",  # Título de sección del correo de N8
+])
+
+LINEA_VACIA = LineaWod("", "", False, False, False, False, False, False, False, None, None, None, False, False, False)
+
+DocumentoWod = namedtuple("DocumentoWod", ["texto", "lineas"])
+
+# Función para clasificar una línea del WOD
+def clasificar_linea(linea):
+    texto = linea.strip()
+    if not texto:
+        return LINEA_VACIA
+    mayusculas = texto.upper()
+    minusculas = texto.lower()
+
+    tipo_entrenamiento = None
+    for tipo in TIPOS_ENTRENAMIENTO:
+        tipo_upper = tipo.upper()
+        if tipo_upper in mayusculas and (mayusculas.startswith(tipo_upper) or len(texto.split()) <= 5):
+            tipo_entrenamiento = tipo_upper
+            break
+
+    item_lista = None
+    if texto.startswith("• ") or REGEX_LISTA_NUMERADA.match(texto) or texto.startswith("-"):
+        item_lista = REGEX_MARCADOR_LISTA.sub('', texto)
+
+    match_seccion = REGEX_SECCION.match(texto)
+
+    return LineaWod(
+        texto=texto,
+        mayusculas=mayusculas,
+        cabecera_wod=minusculas.startswith('wod '),
+        titulo=bool(REGEX_TITULO.match(texto)),
+        equipo=minusculas.startswith('team of'),
+        carrera=bool(REGEX_CARRERA.search(minusculas)),
+        rondas=bool(REGEX_RONDAS.match(minusculas)),
+        tipo_inicial=any(mayusculas.startswith(tipo) for tipo in TIPOS_ENTRENAMIENTO),
+        categoria=any(mayusculas.startswith(categoria) for categoria in CATEGORIAS_PRINCIPALES),
+        seccion=match_seccion.groups() if match_seccion else None,
+        tipo_entrenamiento=tipo_entrenamiento,
+        item_lista=item_lista,
+        categoria_crossfitdb=mayusculas in VARIACIONES_CROSSFITDB,
+        categoria_correo=any(mayusculas.startswith(categoria) for categoria in CATEGORIAS_CORREO),
+        categoria_correo_n8=bool(REGEX_CATEGORIA_CORREO_N8.search(mayusculas)),
+    )
+
+# Función para convertir el texto de un WOD en su documento (se hace una vez por texto)
+@lru_cache(maxsize=256)
+def parsear_documento(texto):
+    """Devuelve un DocumentoWod con todas las líneas del texto ya clasificadas."""
+    return DocumentoWod(texto, tuple(clasificar_linea(linea) for linea in texto.split('\n')))
+
+# Función para renderizar el texto formateado de un WOD de N8
+def renderizar_texto(documento):
+    """
+    Títulos en mayúsculas, subtítulos de carrera/rondas/tipo con su icono y ejercicios con
+    sangría. Se omite la primera línea "WOD ..." porque la fecha ya va en el título.
+    """
+    texto_formateado = []
+    primera_linea = True
+
+    for linea in documento.lineas:
+        if not linea.texto:
+            texto_formateado.append('')
+            continue
+
+        # Saltar la primera línea que contiene "WOD" + fecha
+        if primera_linea and linea.cabecera_wod:
+            primera_linea = False
+            continue
+
+        if linea.titulo:
+            texto_formateado.append(f"\n{linea.mayusculas}")
+        elif linea.equipo:
+            # Quitar las comillas si las tiene
+            texto = linea.texto.replace('"', '').replace('"', '')
+            partes = texto.split('of')
+            if len(partes) > 1:
+                texto_formateado.append(f"\nTEAM OF {partes[1].strip().upper()}\n")
+            else:
+                texto_formateado.append(f"\n{texto.upper()}\n")
+        elif linea.carrera:
+            texto_formateado.append(f"⚡ {linea.mayusculas}")
+        elif linea.rondas:
+            texto_formateado.append(f"🔄 {linea.mayusculas}")
+        elif linea.tipo_inicial:
+            texto_formateado.append(f"⏱️ {linea.mayusculas}")
+        else:
+            # Si es un ejercicio (cualquier otra línea), añadirlo con sangría
+            texto_formateado.append(f"        {linea.texto}")
+
+    return '\n'.join(texto_formateado)
+
+# Función para renderizar el HTML de un WOD de N8 (secciones, listas y tipos de entrenamiento)
+def renderizar_html_n8(documento):
+    html_resultado = []
+    en_seccion = False
+    en_lista = False
+    tipo_entrenamiento_actual = None
+
+    for linea in documento.lineas:
+        texto = linea.texto
+        if not texto:
+            if en_lista:
+                html_resultado.append("</ul>")
+                en_lista = False
+            continue
+
+        if linea.categoria:
+            html_resultado.append(f'<div style="{ESTILO_CATEGORIA}">{linea.mayusculas}</div>')
+            continue
+
+        if linea.seccion:
+            if en_lista:
+                html_resultado.append("</ul>")
+                en_lista = False
+            letra, resto = linea.seccion
+            en_seccion = True
+            tipo_entrenamiento_actual = None  # Reiniciamos el tipo de entrenamiento al cambiar de sección
+            html_resultado.append(f'<div class="section-header">{letra.upper()}) {resto}</div>')
+            continue
+
+        if linea.tipo_entrenamiento:
+            tipo_entrenamiento_actual = linea.tipo_entrenamiento
+            html_resultado.append(f'<div class="workout-type">{texto}</div>')
+            continue
+
+        if linea.item_lista is not None:
+            if not en_lista:
+                html_resultado.append('<ul class="wod-list">')
+                en_lista = True
+            html_resultado.append(f'<li>{linea.item_lista}</li>')
+            continue
+
+        # Dentro de una sección, lo que va indentado o tras un tipo de entrenamiento es una subsección
+        if (en_seccion and texto.startswith("    ")) or tipo_entrenamiento_actual:
+            if tipo_entrenamiento_actual:
+                html_resultado.append(f'<div class="workout-details">{texto}</div>')
+            else:
+                html_resultado.append(f'<div class="subsection">{texto}</div>')
+            continue
+
+        html_resultado.append(f'<div style="{ESTILO_PARRAFO}">{texto}</div>')
+
+    # Cerrar cualquier lista abierta
+    if en_lista:
+        html_resultado.append("</ul>")
+
+    return "\n".join(html_resultado)
+
+# Función para renderizar el HTML de un WOD de CrossFitDB (categorías y ejercicios)
+def renderizar_html_crossfitdb(documento):
+    lineas = documento.lineas
+    # Saltamos la primera línea si contiene "Crossfit"
+    if lineas and "crossfit" in lineas[0].texto.lower():
+        lineas = lineas[1:]
+
+    resultado = []
+    for linea in lineas:
+        if not linea.texto:
+            continue
+        if linea.categoria_crossfitdb:
+            resultado.append(f'<div style="{ESTILO_CATEGORIA}">{linea.mayusculas}</div>')
+        else:
+            resultado.append(f'<div style="{ESTILO_PARRAFO}">{linea.texto}</div>')
+    return '\n'.join(resultado)
+
+# Función para obtener la estructura del WOD en formato serializable a JSON
+def renderizar_json(documento):
+    """Lista de bloques {"tipo", "texto"} (más "letra" en las secciones), sin líneas vacías."""
+    bloques = []
+    for linea in documento.lineas:
+        if not linea.texto:
+            continue
+        if linea.seccion:
+            letra, resto = linea.seccion
+            bloques.append({"tipo": "seccion", "letra": letra.upper(), "texto": resto})
+        elif linea.categoria or linea.categoria_crossfitdb:
+            bloques.append({"tipo": "categoria", "texto": linea.mayusculas})
+        elif linea.tipo_entrenamiento:
+            bloques.append({"tipo": "tipo_entrenamiento", "texto": linea.texto})
+        elif linea.equipo:
+            bloques.append({"tipo": "equipo", "texto": linea.texto})
+        elif linea.item_lista is not None:
+            bloques.append({"tipo": "movimiento", "texto": linea.item_lista})
+        else:
+            bloques.append({"tipo": "movimiento", "texto": linea.texto})
+    return bloques
@@ -0,0 +1,206 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+# Patrones para extraer la fecha del campo notesBreak de N8, en orden de prioridad.
+# Los patrones "wod 3 abr" y "3 abr" de la versión anterior nunca llegaban a producir
+# una fecha (solo capturan día y mes y se descartaban), así que no se incluyen.
+PATRONES_FECHA_NOTAS = [
+    r'wod\s+(\d+)\s+de\s+(\w+)(?:\s+de\s+(\d{4}))?',  # "Wod 3 de Abril (de 2025)"
+    r'(\d+)\s+de\s+(\w+)(?:\s+de\s+(\d{4}))?',        # "3 de Abril (de 2025)"
+    r'(\w+)\s+(\d+)',                                  # "Abril 3"
+    r'wod\s+(?:del?\s+)?(\w+)',                        # "Wod abril" (sin día)
+    r'wod\s+(\w+)\s+(\d+)',                            # "Wod Abril 3"
+    r'wod\s+del?\s+(\d+)/(\d+)(?:/(\d{4}))?',          # "Wod del 3/4/2025"
+]
+
+# Mapa de nombres de meses (y abreviaturas de 3 letras) a números, en el orden en que se comparan
+MESES = {
+    'enero': 1, 'ene': 1,
+    'febrero': 2, 'feb': 2,
+    'marzo': 3, 'mar': 3,
+    'abril': 4, 'abr': 4,
+    'mayo': 5, 'may': 5,
+    'junio': 6, 'jun': 6,
+    'julio': 7, 'jul': 7,
+    'agosto': 8, 'ago': 8,
+    'septiembre': 9, 'sep': 9,
+    'octubre': 10, 'oct': 10,
+    'noviembre': 11, 'nov': 11,
+    'diciembre': 12, 'dic': 12
+}
+
+# Función para comparar un texto con los meses como lo hacía n8 (coincidencia parcial en ambos sentidos)
+def _buscar_mes_parcial(texto):
+    for nombre_mes, numero in MESES.items():
+        if texto in nombre_mes or nombre_mes in texto:
+            return numero
+    return None
+
+# Tabla precalculada con todas las subcadenas de los nombres de meses, que son
+# las palabras que aparecen en la práctica ("abr", "abril", "sept"...)
+TABLA_MESES = {}
+for _nombre_mes in MESES:
+    for _inicio in range(len(_nombre_mes)):
+        for _fin in range(_inicio + 1, len(_nombre_mes) + 1):
+            _subcadena = _nombre_mes[_inicio:_fin]
+            if _subcadena not in TABLA_MESES:
+                TABLA_MESES[_subcadena] = _buscar_mes_parcial(_subcadena)
+
+# Función para convertir el nombre (o parte del nombre) de un mes a su número
+@lru_cache(maxsize=256)
+def numero_mes(texto):
+    """Devuelve el número de mes (1-12) o None. Acepta variaciones como 'abr', 'Sept' o 'abriles'."""
+    texto = texto.lower()
+    mes = TABLA_MESES.get(texto)
+    if mes is None and texto not in TABLA_MESES:
+        # Palabras que contienen el nombre de un mes
+        mes = _buscar_mes_parcial(texto)
+    return mes
+
+# Función para ponerle nombre a cada grupo de un patrón y poder combinarlos en una sola regex
+def _nombrar_grupos(patron, indice):
+    contador = iter(range(100))
+    return re.sub(r'(?<!\\)\((?!\?)', lambda m: f"(?P<p{indice}_{next(contador)}>", patron)
+
+# Función para combinar los patrones desde una posición en una única alternancia
+def _combinar_patrones(desde):
+    """
+    Cada rama '.*?patrón' encuentra la misma coincidencia que re.search(patrón) y las ramas
+    se prueban en orden, así que una sola búsqueda equivale a recorrer la lista de patrones.
+    """
+    ramas = [
+        f"(?P<p{i}>.*?{_nombrar_grupos(patron, i)})"
+        for i, patron in enumerate(PATRONES_FECHA_NOTAS) if i >= desde
+    ]
+    return re.compile(r'(?is)^(?:' + '|'.join(ramas) + ')')
+
+# Una regex por sufijo: si la coincidencia de un patrón no da una fecha válida se sigue con los siguientes
+REGEX_FECHA_NOTAS = [_combinar_patrones(desde) for desde in range(len(PATRONES_FECHA_NOTAS))]
+NOMBRES_GRUPOS = [
+    [f"p{i}_{j}" for j in range(re.compile(patron).groups)]
+    for i, patron in enumerate(PATRONES_FECHA_NOTAS)
+]
+REGEX_NUMERO_DIA = re.compile(r'\b(\d{1,2})\b')
+
+# Función para convertir la coincidencia de un patrón en (día, mes, año)
+def _interpretar_coincidencia(indice, grupos, notas, año_actual):
+    if indice in (2, 4):  # "Abril 3" o "Wod Abril 3"
+        mes, dia = grupos
+        return dia, numero_mes(mes), año_actual
+    if indice == 3:  # "Wod abril": solo se admite abril y se busca un número en el texto
+        if grupos[0].lower() not in ("abril", "abr"):
+            return None
+        dia = "15"  # Default al 15 de abril si no hay número
+        for num in REGEX_NUMERO_DIA.findall(notas):
+            if 1 <= int(num) <= 30:
+                dia = num
+                break
+        return dia, 4, año_actual
+    if indice == 5:  # Fechas numéricas "Wod del 3/4/2025"
+        dia, mes, año = grupos
+        mes = int(mes)
+        return dia, mes if 1 <= mes <= 12 else None, año or año_actual
+    # "Wod 3 de Abril" o "3 de Abril"
+    dia, mes, año = grupos
+    return dia, numero_mes(mes), año or año_actual
+
+# Función para extraer la fecha de un texto libre de N8 (notesBreak)
+def extraer_fecha_notas(notas, año_actual=None):
+    """Devuelve un datetime con la primera fecha válida encontrada en el texto, o None."""
+    if not notas:
+        return None
+    if año_actual is None:
+        año_actual = datetime.now().year
+
+    desde = 0
+    while desde < len(REGEX_FECHA_NOTAS):
+        match = REGEX_FECHA_NOTAS[desde].match(notas)
+        if not match:
+            return None
+        # La rama que ha coincidido es el último grupo cerrado (p0, p1...)
+        indice = int(match.lastgroup[1:])
+        grupos = [match.group(nombre) for nombre in NOMBRES_GRUPOS[indice]]
+        resultado = _interpretar_coincidencia(indice, grupos, notas, año_actual)
+        if resultado:
+            dia, mes, año = resultado
+            if mes and dia and 1 <= int(dia) <= 31:
+                try:
+                    return datetime(int(año), mes, int(dia))
+                except ValueError:
+                    pass
+        # La coincidencia no era una fecha válida: seguir con los patrones siguientes
+        desde = indice + 1
+    return None
+
+# Meses abreviados del campo "day" del timeline de N8 ("28 Mar"), en inglés y en español
+MESES_API = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4,
+    'May': 5, 'Jun': 6, 'Jul': 7, 'Aug': 8,
+    'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+    'Ene': 1, 'Abr': 4, 'Ago': 8, 'Dic': 12
+}
+
+# Función para convertir el mes abreviado de la API en su número
+def numero_mes_api(texto):
+    """Devuelve el número de mes (1-12) o None. Prueba también con el texto capitalizado ('mar' -> 'Mar')."""
+    return MESES_API.get(texto) or MESES_API.get(texto.capitalize())
+
+# Función para extraer el año del campo "when" de la API ("2025-03-28 ...")
+def año_de_when(when):
+    if when and len(when) >= 8:
+        try:
+            año = int(when[:4])
+        except ValueError:
+            return None
+        if 2000 <= año <= 2100:  # Validar que sea un año razonable
+            return año
+    return None
+
+# Función para saber si la fecha de referencia está en los últimos días de su mes
+def _final_de_mes(referencia):
+    return (referencia.day >= 25
+            or (referencia.month in (4, 6, 9, 11) and referencia.day >= 23)
+            or (referencia.month == 2 and referencia.day >= 22))
+
+# Función para decidir el año de una fecha día/mes de la API de N8
+@lru_cache(maxsize=1024)
+def inferir_fecha_api(dia, mes, año_when, referencia):
+    """
+    Devuelve el datetime de (día, mes) eligiendo el año según el año de "when" (o el de la
+    referencia si es None) y la cercanía a la fecha de referencia (date del día de ejecución).
+    Solo depende de sus argumentos; lanza ValueError si la fecha no existe.
+    """
+    año = año_when or referencia.year
+    mes_actual = referencia.month
+    fecha = datetime(año, mes, dia)
+
+    # Mes siguiente al actual (ej. ahora: mar-31, API: abr-1): si no estamos a fin de mes
+    # y la fecha queda casi un año atrás, es del año siguiente
+    if mes == mes_actual % 12 + 1:
+        if not _final_de_mes(referencia) and (referencia - fecha.date()).days > 300:
+            fecha = datetime(año + 1, mes, dia)
+    # Mes anterior al actual (ej. ahora: abr-1, API: mar-31): igual, pasados los primeros 7 días
+    elif mes == (mes_actual - 2) % 12 + 1:
+        if referencia.day > 7 and (referencia - fecha.date()).days >= 300:
+            fecha = datetime(año + 1, mes, dia)
+    # Mes mucho mayor que el actual (ej. ahora: ene, API: oct-dic): probablemente año anterior
+    elif mes > mes_actual + 2 and mes_actual < 10:
+        fecha = datetime(año - 1, mes, dia)
+    # Mes mucho menor que el actual (ej. ahora: dic, API: ene-feb): probablemente año siguiente
+    elif mes < mes_actual - 2 and mes_actual > 2:
+        fecha = datetime(año + 1, mes, dia)
+
+    # Caso especial para la transición marzo-abril
+    if mes_actual == 3 and mes == 4:
+        # Abril estando en marzo: siempre el próximo mes del mismo año
+        fecha = datetime(año, mes, dia)
+    elif mes_actual == 4 and mes == 3:
+        # Marzo estando en abril: del mismo año en los primeros días de abril o si es un día
+        # alto de marzo, y si no del año siguiente
+        if referencia.day <= 10 or dia >= 25:
+            fecha = datetime(año, mes, dia)
+        else:
+            fecha = datetime(año + 1, mes, dia)
+
+    return fecha
@@ -0,0 +1,215 @@
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+
+# Conversión ligera de HTML a texto sin construir un árbol (sustituye a BeautifulSoup.get_text).
+# Reproduce el texto que daba BeautifulSoup(texto, "html.parser").get_text(): misma tokenización
+# (usa el mismo HTMLParser), mismas entidades y el mismo tratamiento de espacios en blanco.
+
+# Entidades con nombre, con y sin ';' final
+ENTIDADES_HTML = {nombre.rstrip(';'): caracter for nombre, caracter in html5.items()}
+
+# Referencias numéricas 0x80-0x9F que en la práctica vienen en Windows-1252
+CARACTERES_WINDOWS_1252 = {}
+for _codigo in range(0x80, 0xA0):
+    try:
+        CARACTERES_WINDOWS_1252[_codigo] = bytes([_codigo]).decode("cp1252")
+    except UnicodeDecodeError:
+        pass
+
+# Etiquetas sin cierre (se cierran al abrirse)
+ETIQUETAS_VACIAS = frozenset([
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr",
+    "image", "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid",
+    "param", "source", "spacer", "track", "wbr"
+])
+# Etiquetas cuyo contenido no forma parte del texto
+ETIQUETAS_SIN_TEXTO = frozenset(["script", "style", "template", "rt", "rp"])
+# Etiquetas dentro de las que no se colapsan los espacios
+ETIQUETAS_PRESERVAR_ESPACIOS = frozenset(["pre", "textarea"])
+ESPACIOS_ASCII = " \n\t\x0c\r"
+
+REGEX_REFERENCIA_DECIMAL = re.compile(r"^([0-9]+)(.*)")
+REGEX_REFERENCIA_HEX = re.compile(r"^([0-9a-f]+)(.*)")
+
+# Función para convertir una referencia numérica (&#...;) en su carácter
+def caracter_numerico(nombre):
+    """Devuelve (carácter, texto sobrante tras la referencia)."""
+    base, regex = 10, REGEX_REFERENCIA_DECIMAL
+    if nombre[:1] in ("x", "X"):
+        nombre, base, regex = nombre[1:], 16, REGEX_REFERENCIA_HEX
+    sobrante = ""
+    try:
+        codigo = int(nombre, base)
+    except ValueError:
+        match = regex.search(nombre)
+        if not match:
+            return "", nombre
+        codigo, sobrante = int(match.group(1), base), match.group(2)
+
+    if codigo == 0 or codigo > 0x10FFFF or 0xD800 <= codigo <= 0xDFFF:
+        return "\ufffd", sobrante
+    return CARACTERES_WINDOWS_1252.get(codigo) or chr(codigo), sobrante
+
+
+class ConversorTexto(HTMLParser):
+    """
+    Recorre el HTML y va juntando los fragmentos de texto. Un fragmento termina en cada
+    etiqueta, comentario o declaración, igual que los NavigableString de BeautifulSoup.
+    sustituir(etiqueta) permite tratar etiquetas concretas (por su texto exacto) como si
+    se hubieran reemplazado por texto antes de procesar el HTML.
+    """
+
+    def __init__(self, sustituir=None):
+        super().__init__(convert_charrefs=False)
+        self.sustituir = sustituir
+        self.fragmentos = []
+        self._datos = []
+        self._abiertas = []
+        self._vacias_cerradas = []
+        self._sin_texto = 0
+        self._preservar = 0
+        self._inicio_cierre = 0
+
+    def _terminar_fragmento(self, incluir=True):
+        if not self._datos:
+            return
+        texto = "".join(self._datos)
+        self._datos = []
+        # Un fragmento solo de espacios se reduce a un salto de línea o un espacio
+        if not self._preservar and not texto.strip(ESPACIOS_ASCII):
+            texto = "\n" if "\n" in texto else " "
+        if incluir:
+            self.fragmentos.append(texto)
+
+    def _abrir(self, etiqueta):
+        self._abiertas.append(etiqueta)
+        if etiqueta in ETIQUETAS_SIN_TEXTO:
+            self._sin_texto += 1
+        if etiqueta in ETIQUETAS_PRESERVAR_ESPACIOS:
+            self._preservar += 1
+
+    def _cerrar(self, etiqueta):
+        self._terminar_fragmento(not self._sin_texto)
+        # Se cierra la última etiqueta abierta con ese nombre y todas las que tenga dentro
+        for i in range(len(self._abiertas) - 1, -1, -1):
+            if self._abiertas[i] == etiqueta:
+                for cerrada in self._abiertas[i:]:
+                    if cerrada in ETIQUETAS_SIN_TEXTO:
+                        self._sin_texto -= 1
+                    if cerrada in ETIQUETAS_PRESERVAR_ESPACIOS:
+                        self._preservar -= 1
+                del self._abiertas[i:]
+                break
+
+    def _sustitucion(self, texto_etiqueta):
+        if self.sustituir is None:
+            return None
+        return self.sustituir(texto_etiqueta)
+
+    def _anadir_sustitucion(self, reemplazo):
+        # Una etiqueta sustituida por "" desaparece sin dejar fragmento
+        if reemplazo:
+            self._datos.append(reemplazo)
+
+    def handle_starttag(self, tag, attrs):
+        reemplazo = self._sustitucion(self.get_starttag_text())
+        if reemplazo is not None:
+            self._anadir_sustitucion(reemplazo)
+            return
+        self._terminar_fragmento(not self._sin_texto)
+        self._abrir(tag)
+        if tag in ETIQUETAS_VACIAS:
+            self._cerrar(tag)
+            # Un cierre explícito posterior (</br>) se ignora
+            self._vacias_cerradas.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        reemplazo = self._sustitucion(self.get_starttag_text())
+        if reemplazo is not None:
+            self._anadir_sustitucion(reemplazo)
+            return
+        self._terminar_fragmento(not self._sin_texto)
+        self._abrir(tag)
+        self._cerrar(tag)
+
+    def parse_endtag(self, i):
+        # Guardar dónde empieza la etiqueta de cierre para poder comparar su texto exacto
+        self._inicio_cierre = i
+        return super().parse_endtag(i)
+
+    def handle_endtag(self, tag):
+        if self.sustituir is not None:
+            texto_etiqueta = self.rawdata[self._inicio_cierre:self.rawdata.find(">", self._inicio_cierre) + 1]
+            reemplazo = self.sustituir(texto_etiqueta)
+            if reemplazo is not None:
+                self._anadir_sustitucion(reemplazo)
+                return
+        if tag in self._vacias_cerradas:
+            self._vacias_cerradas.remove(tag)
+            return
+        self._cerrar(tag)
+
+    def handle_data(self, data):
+        self._datos.append(data)
+
+    def handle_charref(self, name):
+        caracter, sobrante = caracter_numerico(name)
+        self._datos.append(caracter)
+        self._datos.append(sobrante)
+
+    def handle_entityref(self, name):
+        self._datos.append(ENTIDADES_HTML.get(name, "&" + name))
+
+    def handle_comment(self, data):
+        self._terminar_fragmento(not self._sin_texto)
+
+    def handle_decl(self, decl):
+        self._terminar_fragmento(not self._sin_texto)
+
+    def handle_pi(self, data):
+        self._terminar_fragmento(not self._sin_texto)
+
+    def unknown_decl(self, data):
+        self._terminar_fragmento(not self._sin_texto)
+        # El contenido de <![CDATA[...]]> sí es texto
+        if data.upper().startswith("CDATA["):
+            self._datos.append(data[len("CDATA["):])
+            self._terminar_fragmento()
+
+    def close(self):
+        super().close()
+        self._terminar_fragmento(not self._sin_texto)
+
+
+# Función para convertir HTML en texto
+def html_a_texto(html, separador="", sustituir=None):
+    """
+    Equivale a BeautifulSoup(html, "html.parser").get_text(separator=separador).
+    :param sustituir: Función que recibe el texto exacto de una etiqueta y devuelve el
+                      texto por el que sustituirla, o None para tratarla como HTML normal
+    """
+    conversor = ConversorTexto(sustituir)
+    conversor.feed(html)
+    conversor.close()
+    return separador.join(conversor.fragmentos)
+
+
+REGEX_BR = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+# Función para sustituir los <br> por saltos de línea (limpieza de N8)
+def sustituir_br(texto_etiqueta):
+    return "\n" if REGEX_BR.fullmatch(texto_etiqueta) else None
+
+# Etiquetas que la limpieza de CrossFitDB cambia por texto (comparación exacta)
+SUSTITUCIONES_CROSSFITDB = {
+    "<br>": "\n", "<br />": "\n", "<br/>": "\n",
+    "<p>": "", "</p>": "\n",
+    "<h1>": "", "</h1>": "\n",
+    "<h2>": "", "</h2>": "\n",
+    "<h3>": "", "</h3>": "\n",
+    # Preservar listas pero sin añadir bullets
+    "<ul>": "", "</ul>": "",
+    "<ol>": "", "</ol>": "",
+    "<li>": "", "</li>": "\n",
+}
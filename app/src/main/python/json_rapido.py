@@ -0,0 +1,40 @@
+import json
+
+# Codificación y decodificación de JSON en un único sitio: usa orjson si está instalado
+# (bastante más rápido con respuestas grandes como el timeline de N8) y, si no, la
+# librería estándar. Los errores de decodificación son ValueError en ambos casos.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Las fechas se pasan a default como hace json.dumps (en lugar del ISO de orjson)
+    OPCIONES_ORJSON = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# Función para decodificar un JSON (str o bytes)
+def cargar_json(datos):
+    if orjson is not None:
+        return orjson.loads(datos)
+    return json.loads(datos)
+
+# Función para decodificar el cuerpo de una respuesta HTTP
+def json_respuesta(response):
+    """Equivale a response.json(). Si orjson no puede con el cuerpo (p. ej. no es UTF-8) se deja a requests."""
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+# Función para codificar datos como JSON compacto en bytes UTF-8
+def volcar_json_bytes(datos, default=None):
+    """Sin espacios entre elementos y sin escapar los caracteres no ASCII."""
+    if orjson is not None:
+        return orjson.dumps(datos, default=default, option=OPCIONES_ORJSON)
+    return json.dumps(datos, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Función para codificar datos como JSON compacto (str)
+def volcar_json(datos, default=None):
+    return volcar_json_bytes(datos, default).decode("utf-8")
@@ -0,0 +1,139 @@
+from datetime import date, datetime
+from functools import lru_cache
+from json_rapido import cargar_json, volcar_json_bytes
+
+# Codificación compacta de los WODs para pasarlos a Kotlin. Cada WOD lleva su fecha una
+# sola vez, como días desde el 01/01/1970 (LocalDate.ofEpochDay en Kotlin), y los campos
+# que se deducen de ella (fecha_iso, fecha_formateada, dia_semana, titulo...) no se
+# envían: una máscara de bits indica cuáles tenía el WOD para reconstruirlos. Se usa
+# msgpack si está instalado y si no JSON compacto con el mismo esquema.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Versión del esquema (cambiarla si cambian los campos derivados o la forma de las filas)
+VERSION_ESQUEMA = 1
+
+FORMATO_COMPACTO = "msgpack" if msgpack is not None else "json-compacto"
+
+# Buffer inicial de msgpack: por defecto reserva 256 KiB y el payload de una semana
+# ocupa unos pocos KiB (el buffer crece si hace falta)
+TAMANO_BUFFER_MSGPACK = 16 * 1024
+
+ORDINAL_EPOCH = date(1970, 1, 1).toordinal()
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+# Gimnasio de cada lista del payload
+GIMNASIOS = {"wods_n8": "N8", "wods_crossfitdb": "CrossFitDB"}
+
+# Campos que se deducen del día (y del contenido y el gimnasio), en el orden de los bits de la máscara
+CAMPOS_DERIVADOS = (
+    "fecha", "fecha_iso", "fecha_formateada", "dia_semana",
+    "valor_orden", "titulo", "texto_completo", "gimnasio"
+)
+
+BITS_DERIVADOS = {campo: 1 << i for i, campo in enumerate(CAMPOS_DERIVADOS)}
+SEPARADOR_TEXTO_COMPLETO = "\n" + "=" * 40 + "\n"
+
+# Función para calcular los campos que dependen solo del día (se repiten entre gimnasios y semanas)
+@lru_cache(maxsize=512)
+def _derivados_dia(dia):
+    fecha = datetime.fromordinal(dia + ORDINAL_EPOCH)
+    dia_semana = DIAS_SEMANA[fecha.weekday()]
+    fecha_formateada = fecha.strftime("%d/%m/%Y")
+    return {
+        "fecha": fecha,
+        "fecha_iso": fecha.strftime("%Y-%m-%d"),
+        "fecha_formateada": fecha_formateada,
+        "dia_semana": dia_semana,
+        "valor_orden": fecha.weekday() + 1,
+        "titulo": f"WOD DEL {dia_semana} {fecha_formateada}",
+    }
+
+# Función para obtener el valor que tendría un campo derivado
+def _valor_derivado(campo, derivados, contenido, gimnasio):
+    if campo == "gimnasio":
+        return gimnasio
+    if campo == "texto_completo":
+        return derivados["titulo"] + SEPARADOR_TEXTO_COMPLETO + (contenido or "")
+    return derivados[campo]
+
+# Función para obtener los campos de una máscara
+@lru_cache(maxsize=64)
+def _campos_mascara(mascara):
+    return tuple(campo for campo, bit in BITS_DERIVADOS.items() if mascara & bit)
+
+# Función para convertir un WOD en su fila [día, máscara, resto de campos]
+def _fila_wod(wod, gimnasio):
+    fecha = wod.get("fecha")
+    if not isinstance(fecha, datetime):
+        # Sin fecha utilizable todo va en el resto de campos (como str, igual que en el JSON)
+        return [None, 0, {campo: str(valor) if isinstance(valor, date) else valor for campo, valor in wod.items()}]
+
+    dia = fecha.toordinal() - ORDINAL_EPOCH
+    derivados = _derivados_dia(dia)
+    contenido = wod.get("contenido")
+    mascara = 0
+    resto = {}
+    for campo, valor in wod.items():
+        bit = BITS_DERIVADOS.get(campo)
+        if bit is not None and _valor_derivado(campo, derivados, contenido, gimnasio) == valor:
+            mascara |= bit
+        else:
+            # Las fechas que no se pueden deducir (p. ej. con hora) van como en el JSON
+            resto[campo] = str(valor) if isinstance(valor, date) else valor
+    return [dia, mascara, resto]
+
+# Función para reconstruir un WOD a partir de su fila
+def _wod_de_fila(fila, gimnasio):
+    dia, mascara, resto = fila
+    if dia is None:
+        return dict(resto)
+    derivados = _derivados_dia(dia)
+    contenido = resto.get("contenido")
+    wod = {campo: _valor_derivado(campo, derivados, contenido, gimnasio) for campo in _campos_mascara(mascara)}
+    wod.update(resto)
+    return wod
+
+# Función para codificar el payload de WODs de forma compacta
+def codificar_compacto(wods_json):
+    """
+    Recibe el dict de wod_scraper (wods_n8, wods_crossfitdb, fecha_inicio, fecha_fin,
+    total_wods) y devuelve bytes en FORMATO_COMPACTO.
+    """
+    payload = {
+        "v": VERSION_ESQUEMA,
+        "campos_derivados": list(CAMPOS_DERIVADOS),
+        "fecha_inicio": wods_json.get("fecha_inicio"),
+        "fecha_fin": wods_json.get("fecha_fin"),
+        "total_wods": wods_json.get("total_wods"),
+    }
+    for clave, gimnasio in GIMNASIOS.items():
+        payload[clave] = [_fila_wod(wod, gimnasio) for wod in wods_json.get(clave) or []]
+    if msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True, buf_size=TAMANO_BUFFER_MSGPACK)
+    return volcar_json_bytes(payload)
+
+# Función para decodificar el payload compacto al dict original
+def decodificar_compacto(datos):
+    """Detecta el formato por el primer byte ('{' es JSON; un mapa msgpack empieza por 0x8X/0xDE/0xDF)."""
+    if datos[:1] == b"{":
+        payload = cargar_json(datos)
+    elif msgpack is not None:
+        payload = msgpack.unpackb(datos, raw=False)
+    else:
+        raise ValueError("Payload msgpack recibido pero msgpack no está instalado")
+
+    if payload.get("v") != VERSION_ESQUEMA:
+        raise ValueError(f"Versión de esquema no soportada: {payload.get('v')}")
+
+    wods_json = {
+        clave: [_wod_de_fila(fila, gimnasio) for fila in payload.get(clave, [])]
+        for clave, gimnasio in GIMNASIOS.items()
+    }
+    wods_json["fecha_inicio"] = payload.get("fecha_inicio")
+    wods_json["fecha_fin"] = payload.get("fecha_fin")
+    wods_json["total_wods"] = payload.get("total_wods")
+    return wods_json
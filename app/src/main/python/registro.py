@@ -0,0 +1,131 @@
+import atexit
+import os
+import sys
+import threading
+from collections import deque
+from itertools import groupby
+
+# Registro de mensajes con niveles para los scrapers. El destino (Logcat en Android o la
+# consola) se decide una sola vez al importar, los mensajes por debajo de WODIFY_LOG_LEVEL
+# se descartan antes de formatearlos y el resto se acumula en un buffer circular que se
+# vuelca por lotes (también al final de cada sincronización y al salir).
+try:
+    from android.util import Log
+except ImportError:
+    Log = None
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+NIVELES = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR}
+
+# Prioridades de android.util.Log (Log.DEBUG, Log.INFO, Log.WARN y Log.ERROR)
+PRIORIDADES_ANDROID = {DEBUG: 3, INFO: 4, WARNING: 5, ERROR: 6}
+
+# Líneas que se acumulan antes de volcarlas (los errores se vuelcan al momento)
+TAMANO_LOTE = 64
+# Tamaño del buffer circular: si se llena sin volcar se pierden las líneas más antiguas
+CAPACIDAD_BUFFER = 1024
+# Logcat corta las entradas de más de ~4 KiB
+MAXIMO_ENTRADA_LOGCAT = 4000
+
+_nivel_minimo = NIVELES.get(os.getenv("WODIFY_LOG_LEVEL", "INFO").upper(), INFO)
+_buffer = deque(maxlen=CAPACIDAD_BUFFER)
+_cerrojo = threading.Lock()
+_registros = {}
+
+# Función para cambiar el nivel mínimo que se registra ("DEBUG", "INFO", "WARNING" o "ERROR")
+def establecer_nivel(nombre):
+    global _nivel_minimo
+    _nivel_minimo = NIVELES[nombre.upper()]
+
+# Función para saber si un nivel se registra con la configuración actual
+def nivel_activo(nivel):
+    return nivel >= _nivel_minimo
+
+# Función para añadir un mensaje al buffer
+def registrar(tag, nivel, mensaje, args=()):
+    """El mensaje se formatea con % solo si el nivel está activo y hay argumentos."""
+    if nivel < _nivel_minimo:
+        return
+    if args:
+        mensaje = mensaje % args
+    _buffer.append((nivel, tag, str(mensaje)))
+    if nivel >= ERROR or len(_buffer) >= TAMANO_LOTE:
+        volcar()
+
+# Función para escribir en Logcat un grupo de líneas del mismo tag y nivel
+def _escribir_logcat(nivel, tag, mensajes):
+    prioridad = PRIORIDADES_ANDROID[nivel]
+    entrada = ""
+    for mensaje in mensajes:
+        if entrada and len(entrada) + len(mensaje) >= MAXIMO_ENTRADA_LOGCAT:
+            Log.println(prioridad, tag, entrada)
+            entrada = ""
+        entrada = f"{entrada}\n{mensaje}" if entrada else mensaje
+    if entrada:
+        Log.println(prioridad, tag, entrada)
+
+# Función para volcar todas las líneas pendientes
+def volcar():
+    with _cerrojo:
+        lineas = []
+        while _buffer:
+            lineas.append(_buffer.popleft())
+        if not lineas:
+            return
+        if Log is None:
+            sys.stdout.write("".join(f"[{tag}] {mensaje}\n" for _, tag, mensaje in lineas))
+            return
+        # Las líneas seguidas del mismo tag y nivel van en una sola entrada de Logcat
+        for (nivel, tag), grupo in groupby(lineas, key=lambda linea: linea[:2]):
+            _escribir_logcat(nivel, tag, [mensaje for _, _, mensaje in grupo])
+
+atexit.register(volcar)
+
+class Registro:
+    """
+    Registro con un tag fijo. Se puede pasar como log_func: llamarlo equivale a info().
+    Los argumentos se formatean con % solo si el nivel está activo:
+    registro.debug("Elemento %s: %.60s", id_elemento, notas)
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def __call__(self, mensaje, *args):
+        registrar(self.tag, INFO, mensaje, args)
+
+    def debug(self, mensaje, *args):
+        if DEBUG >= _nivel_minimo:
+            registrar(self.tag, DEBUG, mensaje, args)
+
+    def info(self, mensaje, *args):
+        registrar(self.tag, INFO, mensaje, args)
+
+    def warning(self, mensaje, *args):
+        registrar(self.tag, WARNING, mensaje, args)
+
+    def error(self, mensaje, *args):
+        registrar(self.tag, ERROR, mensaje, args)
+
+# Función para obtener el registro de un tag (se crea una vez por tag)
+def obtener_registro(tag):
+    registro = _registros.get(tag)
+    if registro is None:
+        registro = _registros.setdefault(tag, Registro(tag))
+    return registro
+
+# Función para obtener la función de depuración de un log_func
+def depuracion(log_func):
+    """
+    Si log_func es un Registro devuelve su debug(), o None si DEBUG no está activo para que
+    los bucles se salten el mensaje entero (if log_debug: log_debug(f"...")). Con cualquier
+    otra función (p. ej. print) los mensajes se formatean y se le pasan como antes.
+    """
+    debug = getattr(log_func, "debug", None)
+    if debug is not None:
+        return debug if nivel_activo(DEBUG) else None
+    return lambda mensaje, *args: log_func(mensaje % args if args else mensaje)
@@ -1,42 +1,39 @@
 import os
 import sys
 from datetime import datetime, timedelta
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from config import EMAIL_CONFIG
-import re
-
-def log_message(message, tag="WodScraper"):
-    """Loggea a consola o a Logcat si está en Android."""
-    try:
-        # Intentar importar Log de Android
-        from android.util import Log
-        Log.d(tag, str(message))
-    except ImportError:
-        # Si no está en Android, imprimir a consola
-        print(f"[{tag}] {message}")
+from config import EMAIL_CONFIG, SYNC_CONFIG, leer_cache, escribir_cache
+from json_rapido import volcar_json_bytes
+from registro import obtener_registro, volcar as volcar_registro
+from payload_compacto import codificar_compacto, FORMATO_COMPACTO
+from documento_wod import parsear_documento, ESTILO_CATEGORIA, ESTILO_PARRAFO
+from correo_html import (
+    parte_html, fragmentos_plantilla, PLANTILLA_CORREO_UNIFICADO, PLANTILLA_DIA_UNIFICADO,
+    PLANTILLA_WOD_UNIFICADO, CABECERA_CROSSFITDB_UNIFICADO, CABECERA_N8_UNIFICADO,
+    SIN_WOD_UNIFICADO, SIN_WODS_SEMANA_UNIFICADO
+)
+import time
+import asyncio
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Palabras que deben mantenerse en mayúsculas (abreviaturas, términos técnicos)
+MANTENER_MAYUSCULAS = frozenset(["KB", "DB", "RX", "AMRAP", "EMOM", "DU", "HSPU", "BMU", "TTB", "T2B", "C2B", "WB", "BOX", "YGIG", "SC", "KBSR"])
+# Prefijos de palabras que también van en mayúsculas (RX+, TC...)
+PREFIJOS_MAYUSCULAS = ("RX", "TC")
 
 # Función para formatear ejercicios en CamelCase
+@lru_cache(maxsize=2048)
 def formatear_ejercicio(texto):
-    """Convierte el texto de ejercicios a formato CamelCase profesional"""
+    """Convierte el texto de ejercicios a formato CamelCase profesional (las líneas se repiten mucho, así que se cachean)"""
     if not texto:
         return ""
     
-    # Dividir en palabras
-    palabras = texto.strip().split()
     resultado = []
-    
-    # Palabras que deben mantenerse en mayúsculas (abreviaturas, términos técnicos)
-    mantener_mayusculas = ["KB", "DB", "RX", "AMRAP", "EMOM", "DU", "HSPU", "BMU", "TTB", "T2B", "C2B", "WB", "BOX", "YGIG", "SC", "KBSR"]
-    
-    for palabra in palabras:
-        # Verificar si es una palabra que debe mantenerse en mayúsculas
-        if palabra.upper() in mantener_mayusculas:
-            resultado.append(palabra.upper())
-        # Verificar si contiene RX o TC seguido de números/caracteres especiales
-        elif palabra.upper().startswith("RX") or palabra.upper().startswith("TC"):
-            resultado.append(palabra.upper())
+    for palabra in texto.split():
+        mayusculas = palabra.upper()
+        # Abreviaturas y palabras que empiezan por RX o TC seguido de números/caracteres especiales
+        if mayusculas in MANTENER_MAYUSCULAS or mayusculas.startswith(PREFIJOS_MAYUSCULAS):
+            resultado.append(mayusculas)
         # Verificar si es una medida con número (10kg, 15m, 20cal, etc.)
         elif any(c.isdigit() for c in palabra):
             # Mantener números y convertir unidades a minúsculas
@@ -53,157 +50,37 @@ def enviar_correo_unificado(wods_n8, wods_crossfitdb, lunes_fmt, viernes_fmt):
     agrupados por día de la semana.
     """
     try:
+        # smtplib y email solo se cargan si se envía el correo
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        
         # Crear el mensaje
         mensaje = MIMEMultipart()
         mensaje["From"] = EMAIL_CONFIG["remitente"]
         mensaje["To"] = EMAIL_CONFIG["destinatario"]
         mensaje["Subject"] = f"WODs de la Semana - CrossFit DB y N8 🏋️‍♂️"
 
-        # Plantilla HTML con estilos modernos
-        html_template = """
-        <!DOCTYPE html>
-        <html lang="es">
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 800px;
-                    margin: 0 auto;
-                }}
-                .header {{
-                    text-align: center;
-                    padding: 20px;
-                    background: linear-gradient(135deg, #6650a4 0%, #4a3b82 100%);
-                    color: white;
-                    border-radius: 10px;
-                    margin-bottom: 30px;
-                }}
-                .day-section {{
-                    margin-bottom: 40px;
-                    border: 1px solid #e0e0e0;
-                    border-radius: 10px;
-                    overflow: hidden;
-                }}
-                .day-header {{
-                    background-color: #6650a4;
-                    color: white;
-                    padding: 15px;
-                    font-size: 1.2em;
-                    font-weight: bold;
-                    text-align: center;
-                }}
-                .gym-section {{
-                    border-top: 1px solid #eee;
-                    margin-bottom: 10px;
-                }}
-                .gym-header {{
-                    background-color: #ede7f6; /* Morado más claro */
-                    padding: 12px 15px;
-                    font-size: 1.1em;
-                    font-weight: bold;
-                    color: #4a3b82; /* Mantener texto morado oscuro */
-                    display: flex;
-                    align-items: center;
-                }}
-                .wod-content {{
-                    padding: 20px;
-                    background-color: #fff;
-                }}
-                .workout-type {{
-                    font-weight: bold;
-                    color: #4a3b82;
-                    margin: 10px 0;
-                }}
-                .workout-details {{
-                    margin-left: 15px;
-                    color: #555;
-                }}
-                .footer {{
-                    text-align: center;
-                    padding: 20px;
-                    color: #666;
-                    font-size: 0.9em;
-                }}
-                .version {{
-                    text-align: center;
-                    color: #999;
-                    font-size: 0.8em;
-                    margin-top: 10px;
-                }}
-                .no-wod {{
-                    padding: 15px;
-                    color: #777;
-                    font-style: italic;
-                    text-align: center;
-                }}
-                .logo-img {{
-                    height: 30px;
-                    vertical-align: middle;
-                    margin-right: 10px;
-                    display: inline-block;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>
-                    <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/logo%20db%20negro.png" 
-                         alt="CrossFit DB" 
-                         style="height: 40px; vertical-align: middle; margin-right: 15px;">
-                    WODs {lunes_fmt} - {viernes_fmt}
-                    <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/converted_image_transparent.png" 
-                         alt="Box N8" 
-                         style="height: 40px; vertical-align: middle; margin-left: 15px;">
-                </h1>
-                <p>CrossFit DB y Box N8</p>
-            </div>
-            
-            {contenido}
-            
-            <div class="footer">
-                Generado por WOD Scraper v4.1.0<br>
-                {fecha_generacion}
-            </div>
-        </body>
-        </html>
-        """
-
         # Formatear el contenido del WOD para HTML
         def generar_html_wod(wod):
             if wod and 'contenido' in wod:
-                # Si ya existe contenido_html, usarlo
-                if 'contenido_html' in wod and wod['contenido_html']:
+                # Usar contenido_html si viene en el WOD o generarlo ahora (no va en el payload por defecto)
+                contenido_html = wod.get('contenido_html') or renderizar_contenido_html(wod)
+                if contenido_html:
                     # Este contenido ya tiene formato HTML compatible
-                    return wod['contenido_html']
+                    return contenido_html
                 
-                # Si no hay formato HTML, aplicar uno básico
-                # Procesar por líneas para detectar tipos de entrenamiento
-                lineas = wod['contenido'].split('\n')
+                # Si no hay formato HTML, aplicar uno básico a partir de las líneas ya clasificadas
                 html_lines = []
-                
-                # Categorías principales a detectar y formatear
-                categorias_principales = ["STRENGTH", "METCON", "EMOM", "AMRAP", "TABATA", "FOR TIME", "SKILL"]
-                
-                for linea in lineas:
-                    linea = linea.strip()
-                    if not linea:
+                for linea in parsear_documento(wod['contenido']).lineas:
+                    if not linea.texto:
                         continue
                     
-                    # Verificar si es una categoría principal
-                    es_categoria = False
-                    for cat in categorias_principales:
-                        if cat in linea.upper() and (linea.upper().startswith(cat) or linea.upper() == cat):
-                            es_categoria = True
-                            html_lines.append(f'<div style="color: #000000; font-weight: 700; background-color: #f5f5f5; padding: 8px 12px; margin: 10px 0; border-left: 2px solid #2980b9;">{linea.upper()}</div>')
-                            break
-                    
-                    if not es_categoria:
+                    if linea.categoria_correo:
+                        html_lines.append(f'<div style="{ESTILO_CATEGORIA}">{linea.mayusculas}</div>')
+                    else:
                         # Si no es categoría, formatear como detalle con CamelCase
-                        linea_formateada = formatear_ejercicio(linea)
-                        html_lines.append(f'<div style="margin-left: 20px; padding: 5px 0; color: #34495e;">{linea_formateada}</div>')
+                        linea_formateada = formatear_ejercicio(linea.texto)
+                        html_lines.append(f'<div style="{ESTILO_PARRAFO}">{linea_formateada}</div>')
                 
                 if html_lines:
                     return "\n".join(html_lines)
@@ -217,45 +94,23 @@ def enviar_correo_unificado(wods_n8, wods_crossfitdb, lunes_fmt, viernes_fmt):
         # Función específica para formatear los WODs de N8
         def generar_html_wod_n8(wod):
             if wod and 'contenido' in wod:
-                # Procesar por líneas para detectar tipos de entrenamiento
-                lineas = wod['contenido'].split('\n')
                 html_lines = []
-                
-                # Categorías y patrones a detectar para N8
-                patrones_categorias = [
-                    r'^[A-Z]\)\s*(.*)',                 # A) cualquier cosa
-                    r'^[A-Z]\.\)\s*(.*)',               # A.) cualquier cosa 
-                    r'^(?:EMOM|AMRAP)\s*\d+[\'"]?',     # EMOM/AMRAP seguido de números y opcional '/"
-                    r'^(?:TABATA|FOR TIME)',            # TABATA, FOR TIME exactos
-                    r'^.*\bSKILL\b.*',                  # Cualquier cosa con SKILL
-                    r'^STRETCH',                        # STRETCH exacto
-                    r'^ROPE CLIMB',                     # ROPE CLIMB
-                    r'^STRENGTH',                       # STRENGTH exacto
-                    r'(?i)^["\']?team\s+of\s+\d+["\']?' # Team of X con comillas opcionales y case insensitive
-                ]
-                
                 in_section = False  # Para llevar el seguimiento de si estamos dentro de una sección
                 
-                for linea in lineas:
-                    linea = linea.strip()
-                    if not linea:
+                for linea in parsear_documento(wod['contenido']).lineas:
+                    if not linea.texto:
                         continue
                     
                     # Comprobar si es una categoría/título de sección
-                    es_categoria = False
-                    for patron in patrones_categorias:
-                        if re.search(patron, linea.upper()):
-                            es_categoria = True
-                            # Añadir div con margen antes de cada categoría
-                            html_lines.append('<div style="margin-top: 15px;"></div>')
-                            # Aplicar estilo de workout-type igual que CrossFitDB
-                            html_lines.append(f'<div style="color: #000000; font-weight: 700; background-color: #f5f5f5; padding: 8px 12px; margin: 10px 0; border-left: 2px solid #2980b9; display: block;">{linea}</div>')
-                            in_section = True
-                            break
-                    
-                    if not es_categoria:
+                    if linea.categoria_correo_n8:
+                        # Añadir div con margen antes de cada categoría
+                        html_lines.append('<div style="margin-top: 15px;"></div>')
+                        # Aplicar estilo de workout-type igual que CrossFitDB
+                        html_lines.append(f'<div style="{ESTILO_CATEGORIA} display: block;">{linea.texto}</div>')
+                        in_section = True
+                    else:
                         # Si no es categoría, formatear en CamelCase
-                        linea_formateada = formatear_ejercicio(linea)
+                        linea_formateada = formatear_ejercicio(linea.texto)
                         if in_section:
                             html_lines.append(f'<div class="workout-details" style="margin-left: 15px; color: #34495e; padding: 4px 0;">{linea_formateada}</div>')
                         else:
@@ -301,17 +156,17 @@ def enviar_correo_unificado(wods_n8, wods_crossfitdb, lunes_fmt, viernes_fmt):
         # Ordenar por fecha
         fechas_ordenadas = sorted(wods_por_dia.keys())
         
-        # Construir el contenido HTML
-        contenido_html = ""
-        
-        if fechas_ordenadas:
+        # Generar el contenido HTML día a día (fragmentos, sin concatenar el documento)
+        def generar_contenido():
+            if not fechas_ordenadas:
+                yield SIN_WODS_SEMANA_UNIFICADO
+                return
+            
             for fecha_clave in fechas_ordenadas:
                 dia_info = wods_por_dia[fecha_clave]
                 
                 # Formatea la fecha como DD/MM/YYYY
                 fecha_obj = dia_info.get('fecha')
-                fecha_mostrar = ""
-                
                 if fecha_obj:
                     # Si tenemos un objeto datetime, formatearlo correctamente
                     fecha_mostrar = fecha_obj.strftime("%d/%m/%Y")
@@ -320,91 +175,39 @@ def enviar_correo_unificado(wods_n8, wods_crossfitdb, lunes_fmt, viernes_fmt):
                     fecha_mostrar = dia_info['fecha_formateada']
                 
                 # Sección para este día
-                contenido_html += f"""
-                <div class="day-section">
-                    <div class="day-header">
-                        {dia_info['dia_semana']} {fecha_mostrar}
-                    </div>
-                """
+                yield from fragmentos_plantilla(PLANTILLA_DIA_UNIFICADO, dia_semana=dia_info['dia_semana'], fecha=fecha_mostrar)
                 
                 # Contenido de CrossFitDB para este día
-                contenido_html += """
-                    <div class="gym-section">
-                        <div class="gym-header">
-                            <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/logo%20db%20negro.png" 
-                                 alt="CrossFit DB" class="logo-img">
-                            <span>CrossFit DB</span>
-                        </div>
-                """
-                
+                yield CABECERA_CROSSFITDB_UNIFICADO
                 wod_crossfitdb = dia_info['wods_por_gimnasio']['CrossFitDB']
                 if wod_crossfitdb:
-                    contenido_html += f"""
-                        <div class="wod-content">
-                            {generar_html_wod(wod_crossfitdb)}
-                        </div>
-                    """
+                    yield from fragmentos_plantilla(PLANTILLA_WOD_UNIFICADO, contenido=generar_html_wod(wod_crossfitdb))
                 else:
-                    contenido_html += """
-                        <div class="no-wod">
-                            No hay WOD disponible para este día
-                        </div>
-                    """
-                
-                contenido_html += "</div>"  # Fin de CrossFitDB
+                    yield SIN_WOD_UNIFICADO
+                yield "</div>"  # Fin de CrossFitDB
                 
                 # Contenido de N8 para este día
-                contenido_html += """
-                    <div class="gym-section">
-                        <div class="gym-header">
-                            <img src="https://raw.githubusercontent.com/FeloSP8/wod-scraper-app/refs/heads/main/app/src/main/converted_image_transparent.png" 
-                                 alt="Box N8" class="logo-img">
-                            <span>Box N8</span>
-                        </div>
-                """
-                
+                yield CABECERA_N8_UNIFICADO
                 wod_n8 = dia_info['wods_por_gimnasio']['N8']
                 if wod_n8:
-                    contenido_html += f"""
-                        <div class="wod-content">
-                            {generar_html_wod_n8(wod_n8)}
-                        </div>
-                    """
+                    yield from fragmentos_plantilla(PLANTILLA_WOD_UNIFICADO, contenido=generar_html_wod_n8(wod_n8))
                 else:
-                    contenido_html += """
-                        <div class="no-wod">
-                            No hay WOD disponible para este día
-                        </div>
-                    """
-                
-                contenido_html += "</div>"  # Fin de N8
+                    yield SIN_WOD_UNIFICADO
+                yield "</div>"  # Fin de N8
                 
-                contenido_html += "</div>"  # Fin de este día
-        else:
-            contenido_html = """
-            <div class="day-section">
-                <div class="day-header">
-                    Sin WODs disponibles
-                </div>
-                <div class="no-wod">
-                    No se encontraron WODs para esta semana
-                </div>
-            </div>
-            """
+                yield "</div>"  # Fin de este día
 
         # Formatear la fecha actual
         fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M")
 
-        # Reemplazar el contenido en la plantilla
-        html_final = html_template.format(
-            contenido=contenido_html,
+        # Volcar la plantilla con el contenido directamente en la parte HTML del mensaje
+        mensaje.attach(parte_html(fragmentos_plantilla(
+            PLANTILLA_CORREO_UNIFICADO,
+            contenido=generar_contenido(),
             fecha_generacion=fecha_generacion,
             lunes_fmt=lunes_fmt,
             viernes_fmt=viernes_fmt
-        )
-
-        # Adjuntar el HTML al mensaje
-        mensaje.attach(MIMEText(html_final, "html"))
+        )))
 
         # Configurar el servidor SMTP y enviar el correo
         with smtplib.SMTP(EMAIL_CONFIG["servidor_smtp"], EMAIL_CONFIG["puerto_smtp"]) as servidor:
@@ -424,7 +227,258 @@ def formatear_nombre_propio(texto):
         return texto
     return texto[0].upper() + texto[1:].lower()
 
-def main(include_weekends=None):
+# Función para generar bajo demanda el contenido_html de un WOD con el formato de su gimnasio
+def renderizar_contenido_html(wod):
+    if wod.get("gimnasio") == "N8":
+        import n8
+        return n8.formatear_wod_para_correo(wod.get("contenido") or "")
+    import crossfitdb
+    return crossfitdb.formatear_wod_para_correo(wod.get("contenido") or "")
+
+# Función para dejar contenido_html como se ha pedido: generarlo si falta o quitarlo
+def ajustar_contenido_html(wod, incluir_html):
+    """Hace falta para los WODs de la caché, que pueden venir de una sincronización con la otra opción."""
+    if not incluir_html:
+        wod.pop("contenido_html", None)
+    elif "contenido_html" not in wod:
+        wod["contenido_html"] = renderizar_contenido_html(wod)
+
+# Nombre del archivo donde se recuerdan los WODs ya descargados por (gimnasio, fecha)
+ARCHIVO_CACHE_WODS = "wods_semana.json"
+
+# Función para obtener las fechas (date) entre inicio y fin, ambos incluidos
+def dias_entre(inicio, fin, include_weekends=True):
+    dias = []
+    dia = inicio.date()
+    while dia <= fin.date():
+        if include_weekends or dia.weekday() < 5:
+            dias.append(dia)
+        dia += timedelta(days=1)
+    return dias
+
+# Función para cargar la caché de WODs descartando los días ya pasados
+def cargar_cache_wods():
+    cache = leer_cache(ARCHIVO_CACHE_WODS) or {}
+    hoy_iso = datetime.now().date().isoformat()
+    for gimnasio, dias in cache.items():
+        cache[gimnasio] = {fecha: entrada for fecha, entrada in dias.items() if fecha >= hoy_iso}
+    return cache
+
+# Función para obtener los días que faltan o están caducados para un gimnasio
+def fechas_pendientes(cache, gimnasio, fechas):
+    ahora = time.time()
+    dias = cache.get(gimnasio, {})
+    pendientes = []
+    for fecha in fechas:
+        entrada = dias.get(fecha.isoformat())
+        if not entrada:
+            pendientes.append(fecha)
+            continue
+        ttl = SYNC_CONFIG["ttl_wod"] if entrada.get("wods") else SYNC_CONFIG["ttl_sin_wod"]
+        if ahora - entrada.get("actualizado", 0) >= ttl:
+            pendientes.append(fecha)
+    return pendientes
+
+# Función para guardar en la caché el resultado de consultar unas fechas
+def actualizar_cache_wods(cache, gimnasio, fechas, wods):
+    ahora = time.time()
+    dias = cache.setdefault(gimnasio, {})
+    # Las fechas consultadas sin WOD también se recuerdan (con un TTL más corto)
+    for fecha in fechas:
+        dias[fecha.isoformat()] = {"actualizado": ahora, "wods": []}
+    for wod in wods or []:
+        entrada = dias.get(wod["fecha"].date().isoformat())
+        if entrada is not None:
+            entrada["wods"].append(dict(wod, fecha=wod["fecha"].isoformat()))
+    escribir_cache(ARCHIVO_CACHE_WODS, cache)
+
+# Función para reconstruir de la caché los WODs conocidos de unas fechas
+def wods_de_cache(cache, gimnasio, fechas):
+    dias = cache.get(gimnasio, {})
+    wods = []
+    for fecha in fechas:
+        for wod in dias.get(fecha.isoformat(), {}).get("wods", []):
+            wods.append(dict(wod, fecha=datetime.fromisoformat(wod["fecha"])))
+    return wods
+
+# Función para crear la función que entrega los WODs de un gimnasio según llegan (modo streaming)
+def crear_emisor(on_wod, tag, incluir_html=False):
+    """
+    Devuelve None si no hay on_wod. El WOD se entrega con el día ya formateado, como en el
+    resultado final, y un error en on_wod solo se registra: no corta la sincronización.
+    Los días ya entregados (p. ej. desde la caché) no se repiten.
+    """
+    if not on_wod:
+        return None
+    fechas_emitidas = set()
+    
+    def emitir(wod, desde_cache=False):
+        fecha = wod["fecha"].date()
+        if not desde_cache and fecha in fechas_emitidas:
+            return
+        fechas_emitidas.add(fecha)
+        wod['dia_semana'] = formatear_nombre_propio(wod['dia_semana'])
+        ajustar_contenido_html(wod, incluir_html)
+        try:
+            on_wod(wod)
+        except Exception as e:
+            obtener_registro(tag).warning(f"⚠️ Error en on_wod: {str(e)}")
+    return emitir
+
+# Función para entregar primero los WODs que ya están en la caché (los de hoy delante)
+def emitir_de_cache(emitir, cache, gimnasio, fechas):
+    if not emitir:
+        return
+    hoy = datetime.now().date()
+    for wod in sorted(wods_de_cache(cache, gimnasio, fechas), key=lambda wod: wod["fecha"].date() != hoy):
+        emitir(wod, desde_cache=True)
+
+# Función asíncrona para obtener los WODs de N8 (con sincronización incremental)
+async def obtener_wods_n8_async(cache_wods, incremental, on_wod=None, incluir_html=False):
+    """Devuelve (wods, texto de resumen) de N8."""
+    resumen = ""
+    try:
+        import n8
+        emitir = crear_emisor(on_wod, "WodN8", incluir_html)
+        inicio_n8, fin_n8 = n8.obtener_rango_semana_actual()
+        fechas_n8 = dias_entre(inicio_n8, fin_n8)
+        pendientes_n8 = fechas_pendientes(cache_wods, "N8", fechas_n8) if incremental else fechas_n8
+        if incremental:
+            emitir_de_cache(emitir, cache_wods, "N8", [fecha for fecha in fechas_n8 if fecha not in pendientes_n8])
+        
+        wods_n8 = None
+        if pendientes_n8:
+            wods_n8 = await n8.main_async(log_func=obtener_registro("WodN8"), on_wod=emitir, incluir_html=incluir_html)
+            # El timeline de N8 trae toda la semana de una vez ([] si no hay ninguno, None si falla)
+            if incremental and wods_n8 is not None:
+                actualizar_cache_wods(cache_wods, "N8", fechas_n8, wods_n8)
+        else:
+            resumen += "ℹ️ WODs de N8 al día, no se consulta\n"
+        if incremental:
+            wods_n8 = wods_de_cache(cache_wods, "N8", fechas_n8) or wods_n8
+        
+        if wods_n8:
+            # Asegurar que los días y meses estén correctamente formateados
+            for wod in wods_n8:
+                wod['dia_semana'] = formatear_nombre_propio(wod['dia_semana'])
+                ajustar_contenido_html(wod, incluir_html)
+            resumen += f"✅ Se encontraron {len(wods_n8)} WODs de N8\n"
+        else:
+            resumen += "⚠️ No se encontraron WODs de N8\n"
+    except Exception as e:
+        resumen += f"❌ Error al obtener WODs de N8: {str(e)}\n"
+        wods_n8 = None
+    return wods_n8, resumen
+
+# Función asíncrona para obtener los WODs de CrossFitDB (con sincronización incremental)
+async def obtener_wods_crossfitdb_async(cache_wods, incremental, on_wod=None, incluir_html=False):
+    """Devuelve (wods, texto de resumen) de CrossFitDB."""
+    resumen = ""
+    try:
+        import crossfitdb
+        emitir = crear_emisor(on_wod, "WodCFDB", incluir_html)
+        inicio_cfdb, fin_cfdb = crossfitdb.obtener_rango_semana_actual()
+        fechas_cfdb = dias_entre(inicio_cfdb, fin_cfdb, include_weekends=False)
+        pendientes_cfdb = fechas_pendientes(cache_wods, "CrossFitDB", fechas_cfdb) if incremental else None
+        if incremental:
+            emitir_de_cache(emitir, cache_wods, "CrossFitDB", [fecha for fecha in fechas_cfdb if fecha not in pendientes_cfdb])
+        
+        wods_crossfitdb = None
+        if not incremental:
+            wods_crossfitdb = await crossfitdb.main_async(
+                semana=True,
+                log_func=obtener_registro("WodCFDB"),
+                on_wod=emitir,
+                incluir_html=incluir_html
+            )
+        elif pendientes_cfdb:
+            # Solo los días que faltan o están caducados
+            fechas_fallidas = set()
+            wods_crossfitdb = await crossfitdb.main_async(
+                semana=True,
+                fechas=[datetime.combine(fecha, datetime.min.time()) for fecha in pendientes_cfdb],
+                log_func=obtener_registro("WodCFDB"),
+                on_wod=emitir,
+                incluir_html=incluir_html,
+                fechas_fallidas=fechas_fallidas
+            )
+            # None es un fallo general; los días que fallaron se vuelven a pedir en la próxima sincronización
+            if wods_crossfitdb is not None:
+                consultadas = [fecha for fecha in pendientes_cfdb if fecha not in fechas_fallidas]
+                actualizar_cache_wods(cache_wods, "CrossFitDB", consultadas, wods_crossfitdb)
+        else:
+            resumen += "ℹ️ WODs de CrossFitDB al día, no se consulta\n"
+        if incremental:
+            wods_crossfitdb = wods_de_cache(cache_wods, "CrossFitDB", fechas_cfdb) or wods_crossfitdb
+        
+        if wods_crossfitdb:
+            # Asegurar que los días y meses estén correctamente formateados
+            for wod in wods_crossfitdb:
+                wod['dia_semana'] = formatear_nombre_propio(wod['dia_semana'])
+                ajustar_contenido_html(wod, incluir_html)
+            resumen += f"✅ Se encontraron {len(wods_crossfitdb)} WODs de CrossFitDB\n"
+        else:
+            resumen += "⚠️ No se encontraron WODs de CrossFitDB\n"
+    except Exception as e:
+        resumen += f"❌ Error al obtener WODs de CrossFitDB: {str(e)}\n"
+        wods_crossfitdb = None
+    return wods_crossfitdb, resumen
+
+# Función asíncrona que aplica el tiempo máximo de espera a un gimnasio
+async def con_tiempo_limite(corrutina, nombre, timeout):
+    """Si el gimnasio no responde a tiempo se cancela y se trata como sin WODs."""
+    try:
+        return await asyncio.wait_for(corrutina, timeout)
+    except asyncio.TimeoutError:
+        return None, f"❌ {nombre} no respondió en {timeout:g} s, se continúa sin sus WODs\n"
+
+# Función asíncrona que ejecuta los pipelines de ambos gimnasios en paralelo en un único event loop
+async def obtener_wods_gimnasios_async(cache_wods, incremental, timeout=None, on_wod=None, incluir_html=False):
+    """
+    Devuelve (wods_n8, wods_crossfitdb, texto de resumen) cuando ambos han terminado o caducado.
+    Con on_wod cada WOD se entrega además en cuanto está listo, sin esperar al otro gimnasio.
+    """
+    if timeout is None:
+        timeout = SYNC_CONFIG["timeout_fuente"]
+    (wods_n8, resumen_n8), (wods_crossfitdb, resumen_cfdb) = await asyncio.gather(
+        con_tiempo_limite(obtener_wods_n8_async(cache_wods, incremental, on_wod, incluir_html), "N8", timeout),
+        con_tiempo_limite(obtener_wods_crossfitdb_async(cache_wods, incremental, on_wod, incluir_html), "CrossFitDB", timeout)
+    )
+    resumen = "📱 Obteniendo WODs de N8...\n" + resumen_n8
+    resumen += "\n🌐 Obteniendo WODs de CrossfitDB...\n" + resumen_cfdb
+    return wods_n8, wods_crossfitdb, resumen
+
+# Función para ejecutar el motor asíncrono sin esperar a peticiones que quedaron colgadas
+def ejecutar_event_loop(corrutina):
+    """
+    asyncio.run espera a que terminen todos los hilos de to_thread al cerrar, lo que
+    anularía el tiempo límite por gimnasio. Aquí el ejecutor se cierra sin esperar.
+    """
+    loop = asyncio.new_event_loop()
+    ejecutor = ThreadPoolExecutor(thread_name_prefix="wod_scraper")
+    loop.set_default_executor(ejecutor)
+    try:
+        return loop.run_until_complete(corrutina)
+    finally:
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+        loop.close()
+
+# Resumen final del proceso según su estado
+MENSAJES_ESTADO = {
+    "ok": "\n✅ Proceso completado correctamente",
+    "parcial": "\n⚠️ Proceso completado con algunos errores",
+    "error": "\n❌ Proceso completado con errores"
+}
+
+# Función que ejecuta el scraper y separa el registro de los datos
+def _ejecutar_scraper(incremental, codificar=None, on_wod=None, incluir_html=False):
+    """
+    Devuelve (log, wods, total_wods, estado, resumen). El resumen final va aparte para
+    que main pueda colocar el JSON delante, como siempre; si hay un error general no hay resumen.
+    :param codificar: Función que convierte el dict de WODs en bytes (None para devolver el dict)
+    :param on_wod: Función a la que se pasa cada WOD en cuanto está listo
+    :param incluir_html: Si los WODs llevan contenido_html (ver renderizar_contenido_html)
+    """
     result = "🏋️ WOD Scraper Unificado v3.0.2\n"
     result += "=" * 42 + "\n"
 
@@ -455,55 +509,34 @@ def main(include_weekends=None):
         lunes_fmt = lunes.strftime("%d/%m/%Y")
         result += f"🗓️ Buscando WODs: {lunes_fmt} al {viernes_fmt}\n\n"
 
-        # Import the modules directly instead of using subprocess
-        result += "📱 Obteniendo WODs de N8...\n"
-        try:
-            import n8
-            wods_n8 = n8.main(log_func=lambda msg: log_message(msg, tag="WodN8"))
-            if wods_n8:
-                # Asegurar que los días y meses estén correctamente formateados
-                for wod in wods_n8:
-                    wod['dia_semana'] = formatear_nombre_propio(wod['dia_semana'])
-                result += f"✅ Se encontraron {len(wods_n8)} WODs de N8\n"
-            else:
-                result += "⚠️ No se encontraron WODs de N8\n"
-        except Exception as e:
-            result += f"❌ Error al obtener WODs de N8: {str(e)}\n"
-            wods_n8 = None
+        # Sincronización incremental: recordar qué días ya se conocen y cuándo se consultaron
+        if incremental is None:
+            incremental = SYNC_CONFIG["incremental"]
+        cache_wods = cargar_cache_wods() if incremental else None
 
-        result += "\n🌐 Obteniendo WODs de CrossfitDB...\n"
-        try:
-            import crossfitdb
-            wods_crossfitdb = crossfitdb.main(semana=True, log_func=lambda msg: log_message(msg, tag="WodCFDB"))
-            if wods_crossfitdb:
-                # Asegurar que los días y meses estén correctamente formateados
-                for wod in wods_crossfitdb:
-                    wod['dia_semana'] = formatear_nombre_propio(wod['dia_semana'])
-                result += f"✅ Se encontraron {len(wods_crossfitdb)} WODs de CrossFitDB\n"
-            else:
-                result += "⚠️ No se encontraron WODs de CrossFitDB\n"
-        except Exception as e:
-            result += f"❌ Error al obtener WODs de CrossFitDB: {str(e)}\n"
-            wods_crossfitdb = None
+        # Ambos gimnasios se consultan a la vez; el JSON se arma cuando los dos han terminado o caducado
+        wods_n8, wods_crossfitdb, resumen = ejecutar_event_loop(obtener_wods_gimnasios_async(cache_wods, incremental, on_wod=on_wod, incluir_html=incluir_html))
+        result += resumen
 
         # Verificar si hay WODs disponibles
         tiene_wods = (wods_n8 is not None and len(wods_n8) > 0) or (wods_crossfitdb is not None and len(wods_crossfitdb) > 0)
         
+        wods = None
+        total_wods = 0
         if tiene_wods:
-            # NUEVO: Devolver JSON en lugar de enviar correo
-            import json
-            
             # Preparar datos para Kotlin/Android
-            wods_json = {
+            total_wods = (len(wods_n8) if wods_n8 else 0) + (len(wods_crossfitdb) if wods_crossfitdb else 0)
+            wods = {
                 'wods_n8': wods_n8 if wods_n8 else [],
                 'wods_crossfitdb': wods_crossfitdb if wods_crossfitdb else [],
                 'fecha_inicio': lunes_fmt,
                 'fecha_fin': viernes_fmt,
-                'total_wods': (len(wods_n8) if wods_n8 else 0) + (len(wods_crossfitdb) if wods_crossfitdb else 0)
+                'total_wods': total_wods
             }
+            if codificar:
+                wods = codificar(wods)
             
-            result += f"\n✅ WODs preparados para la app: {wods_json['total_wods']} WODs encontrados\n"
-            result += f"\n📊 JSON_DATA_START\n{json.dumps(wods_json, default=str)}\nJSON_DATA_END\n"
+            result += f"\n✅ WODs preparados para la app: {total_wods} WODs encontrados\n"
         else:
             result += "\n⚠️ No hay WODs disponibles\n"
 
@@ -511,17 +544,73 @@ def main(include_weekends=None):
         tiene_error = "❌" in result
         
         if tiene_error and tiene_wods:
-            result += "\n⚠️ Proceso completado con algunos errores"
+            estado = "parcial"
         elif tiene_error:
-            result += "\n❌ Proceso completado con errores"
+            estado = "error"
         else:
-            result += "\n✅ Proceso completado correctamente"
+            estado = "ok"
             
-        return result
+        return result, wods, total_wods, estado, MENSAJES_ESTADO[estado]
 
     except Exception as e:
         result += f"\n❌ Error general en el scraper: {str(e)}"
-        return result
+        return result, None, 0, "error", ""
+    finally:
+        # Volcar lo que quede en el buffer del registro de los scrapers
+        volcar_registro()
+
+# Función para codificar el dict de WODs como JSON (fechas como texto)
+def codificar_json(wods):
+    return volcar_json_bytes(wods, default=str)
+
+# Función para obtener los WODs como datos, con el registro en un campo aparte
+def obtener_wods(include_weekends=None, incremental=None, serializado=False, compacto=False, on_wod=None, incluir_html=False):
+    """
+    Obtiene los WODs de N8 y CrossFitDB sin mezclarlos con el texto del proceso.
+    :param serializado: Si True, "wods" son bytes JSON (UTF-8) en lugar de un dict
+    :param compacto: Si True, "wods" son bytes con el esquema compacto de payload_compacto
+                     (msgpack o JSON compacto, ver "formato"); tiene prioridad sobre serializado
+    :param on_wod: Modo streaming: función a la que se pasa cada WOD (con su campo "gimnasio")
+                   en cuanto está listo, los de hoy primero y sin esperar al otro gimnasio.
+                   Con serializado o compacto se le pasa como bytes JSON. El resultado final
+                   no cambia
+    :param incluir_html: Si cada WOD lleva contenido_html. Por defecto no: la app muestra
+                         "contenido" y el HTML se genera al enviar el correo (renderizar_contenido_html)
+    :return: dict con "wods" (None si no hay), "formato" ("dict", "json", "msgpack" o
+             "json-compacto"), "total_wods", "estado" ("ok", "parcial" o "error") y "log"
+             (el texto legible del proceso)
+    """
+    if compacto:
+        codificar, formato = codificar_compacto, FORMATO_COMPACTO
+    elif serializado:
+        codificar, formato = codificar_json, "json"
+    else:
+        codificar, formato = None, "dict"
+    emitir = on_wod
+    if on_wod and codificar:
+        # Cada WOD suelto va como JSON (el esquema compacto es para el payload completo)
+        emitir = lambda wod: on_wod(codificar_json(wod))
+    log, wods, total_wods, estado, resumen = _ejecutar_scraper(incremental, codificar, emitir, incluir_html)
+    return {
+        "wods": wods,
+        "formato": formato,
+        "total_wods": total_wods,
+        "estado": estado,
+        "log": log + resumen
+    }
+
+def main(include_weekends=None, incremental=None, incluir_html=False):
+    """
+    Obtiene los WODs de N8 y CrossFitDB y los devuelve como JSON dentro del texto de resultado.
+    :param include_weekends: Se mantiene por compatibilidad con las llamadas existentes
+    :param incremental: Si solo se consultan los días que faltan o están caducados
+                        (por defecto WODIFY_SYNC_INCREMENTAL)
+    :param incluir_html: Si cada WOD lleva contenido_html (por defecto no)
+    """
+    log, wods, _, _, resumen = _ejecutar_scraper(incremental, codificar_json, incluir_html=incluir_html)
+    if wods is not None:
+        log += f"\n📊 JSON_DATA_START\n{wods.decode('utf-8')}\nJSON_DATA_END\n"
+    return log + resumen
 
 if __name__ == "__main__":
     print(main())
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Benchmark de la conversión del campo "day" del timeline de N8 (n8.parsear_fecha_api).
+
+Compara la versión anterior (diccionario de meses creado en cada llamada y datetime.now()
+dentro de la función) con la actual (tabla de meses precalculada e inferencia del año
+pura y cacheada con fechas.inferir_fecha_api).
+
+Antes de medir recorre una tabla con todos los cambios de mes del año: como fecha de
+referencia, los últimos y primeros días de cada mes; como entrada, días del mes anterior,
+del actual y de los dos siguientes, con el año de "when" vacío, igual, anterior o
+siguiente. Comprueba que ambas versiones dan la misma fecha en todos los casos.
+
+Uso: python benchmarks/bench_fecha_api.py [--elementos 5000] [--repeticiones 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+from n8 import parsear_fecha_api  # noqa: E402
+
+MESES_INGLES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+# Implementación anterior de n8.parsear_fecha_api; solo cambia que "hoy" se recibe como
+# parámetro en lugar de llamar a datetime.now()
+def parsear_fecha_api_anterior(fecha_str, when_str=None, hoy=None):
+    try:
+        meses = {
+            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4,
+            'May': 5, 'Jun': 6, 'Jul': 7, 'Aug': 8,
+            'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+            'Ene': 1, 'Feb': 2, 'Mar': 3, 'Abr': 4,
+            'May': 5, 'Jun': 6, 'Jul': 7, 'Ago': 8,
+            'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dic': 12
+        }
+        partes = fecha_str.split()
+        if len(partes) != 2:
+            return None
+        dia_str = partes[0]
+        mes_str = partes[1]
+        if not dia_str.isdigit():
+            return None
+        mes = meses.get(mes_str)
+        if not mes:
+            mes = meses.get(mes_str.capitalize())
+        if not mes:
+            return None
+        dia = int(dia_str)
+
+        hoy = hoy or datetime.now()
+        año = hoy.year
+        if when_str and len(when_str) >= 8:
+            try:
+                año_from_when = int(when_str[:4])
+                if 2000 <= año_from_when <= 2100:
+                    año = año_from_when
+            except ValueError:
+                pass
+
+        fecha_tentativa = datetime(año, mes, dia)
+        mes_actual = hoy.month
+        if mes == mes_actual + 1 or (mes_actual == 12 and mes == 1):
+            if hoy.day >= 25 or (mes_actual in [4, 6, 9, 11] and hoy.day >= 23) or (mes_actual == 2 and hoy.day >= 22):
+                pass
+            else:
+                if (hoy - fecha_tentativa).days > 300:
+                    fecha_tentativa = datetime(año + 1, mes, dia)
+        elif mes == mes_actual - 1 or (mes_actual == 1 and mes == 12):
+            if hoy.day <= 7:
+                pass
+            else:
+                if (fecha_tentativa - hoy).days < -300:
+                    fecha_tentativa = datetime(año + 1, mes, dia)
+        elif mes > mes_actual + 2 and mes_actual < 10:
+            fecha_tentativa = datetime(año - 1, mes, dia)
+        elif mes < mes_actual - 2 and mes_actual > 2:
+            fecha_tentativa = datetime(año + 1, mes, dia)
+
+        if (mes_actual == 3 and mes == 4) or (mes_actual == 4 and mes == 3):
+            if mes == 4 and mes_actual == 3:
+                fecha_tentativa = datetime(año, mes, dia)
+            elif mes == 3 and mes_actual == 4:
+                if hoy.day <= 10:
+                    fecha_tentativa = datetime(año, mes, dia)
+                else:
+                    if dia >= 25:
+                        fecha_tentativa = datetime(año, mes, dia)
+                    else:
+                        fecha_tentativa = datetime(año + 1, mes, dia)
+        return fecha_tentativa
+    except (ValueError, AttributeError, KeyError):
+        return None
+
+
+# Función para generar la tabla de casos de todos los cambios de mes
+def tabla_cambios_de_mes(año=2025):
+    casos = []
+    for mes in range(1, 13):
+        primero = date(año, mes, 1)
+        ultimo = (primero + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        # Referencias: últimos 10 días del mes y primeros 10 del siguiente
+        referencias = [ultimo - timedelta(days=i) for i in range(10)]
+        referencias += [ultimo + timedelta(days=i) for i in range(1, 11)]
+        for referencia in referencias:
+            for desplazamiento in (-1, 0, 1, 2):
+                mes_api = (referencia.month - 1 + desplazamiento) % 12 + 1
+                for dia in (1, 2, 7, 10, 15, 24, 25, 28, 29, 30, 31):
+                    for when in (None, "", f"{referencia.year}-01-01", f"{referencia.year - 1}-12-31", f"{referencia.year + 1}-01-01", "abcd-ef-gh"):
+                        casos.append((f"{dia} {MESES_INGLES[mes_api - 1]}", when, referencia))
+    # Abreviaturas en español y variaciones de mayúsculas
+    referencia = date(año, 4, 15)
+    for texto in ("3 Abr", "3 abr", "3 MAR", "12 Ago", "31 Dic", "1 ene", "28 Mar", "Mar 28", "28", "x Mar", "28 Foo"):
+        casos.append((texto, None, referencia))
+    return casos
+
+
+def medir(funcion, casos, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for fecha_str, when, referencia in casos:
+            funcion(fecha_str, when, referencia)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--elementos", type=int, default=5000, help="Elementos del timeline por ejecución")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    # Comprobar la tabla de cambios de mes (la versión anterior con "hoy" a mediodía)
+    casos = tabla_cambios_de_mes()
+    diferencias = 0
+    with contextlib.redirect_stdout(io.StringIO()):  # Mensajes de fechas inexistentes (31 Apr...)
+        resultados = [
+            (caso, parsear_fecha_api_anterior(caso[0], caso[1], datetime.combine(caso[2], datetime.min.time()).replace(hour=12)),
+             parsear_fecha_api(*caso))
+            for caso in casos
+        ]
+    for caso, anterior, nueva in resultados:
+        if anterior != nueva:
+            diferencias += 1
+            print(f"DIFERENCIA {caso}: anterior={anterior} nueva={nueva}")
+    if diferencias:
+        sys.exit(1)
+    print(f"Tabla de cambios de mes: {len(casos)} casos idénticos")
+
+    # Una ejecución: muchos elementos del timeline con la misma referencia
+    referencia = date(2025, 3, 30)
+    hoy = datetime(2025, 3, 30, 12)
+    elementos = [
+        (f"{1 + i % 28} {MESES_INGLES[(2 + i // 28) % 12]}", f"2025-0{3 + (i // 28) % 2}-01 10:00", referencia)
+        for i in range(args.elementos)
+    ]
+    elementos_anterior = [(fecha_str, when, hoy) for fecha_str, when, _ in elementos]
+    t_anterior = medir(parsear_fecha_api_anterior, elementos_anterior, args.repeticiones)
+    t_nueva = medir(parsear_fecha_api, elementos, args.repeticiones)
+
+    print(f"Elementos procesados: {len(elementos)}")
+    print(f"Anterior: {t_anterior * 1000:.2f} ms")
+    print(f"Nueva:    {t_nueva * 1000:.2f} ms")
+    print(f"Mejora:   x{t_anterior / t_nueva:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Benchmark de la extracción de fechas de notesBreak (N8).
+
+Compara el bucle de patrones original de n8.main con fechas.extraer_fecha_notas
+sobre un corpus de textos notesBreak, repetido para simular varios meses de histórico,
+y comprueba que ambos devuelven la misma fecha.
+
+Por defecto usa un corpus sintético imitando el formato de N8; con --corpus se usan los
+notesBreak de una o varias respuestas grabadas del timeline de N8 (/api/activity).
+
+Uso: python benchmarks/bench_fechas_notas.py [--corpus timeline.json ...] [--dias 180] [--repeticiones 5]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+from fechas import extraer_fecha_notas  # noqa: E402
+
+# Textos sintéticos imitando los notesBreak del timeline de N8 (corpus por defecto)
+CORPUS = [
+    "WOD 3 de Abril",
+    "Wod 14 de octubre de 2025",
+    "wod 21 de Noviembre",
+    "7 de marzo",
+    "Lunes 12 de Mayo - Fuerza",
+    "Abril 3",
+    "Wod Octubre 21",
+    "Wod Septiembre 9",
+    "wod abril semana 7",
+    "Wod abril",
+    "Wod del 3/4/2025",
+    "wod del 28/2",
+    "SABAPARTNER",
+    "FUNDAY",
+    "Sabapartner 18 de octubre",
+    "WOD 31 de febrero y 2 de marzo",
+    "Team of 2\nWod 5 de Junio\nAMRAP 20'",
+    "Back squat 5x5 @ 75% - EMOM 12'",
+    "Open 24.1 repetición",
+    "Wod del día",
+    "Semana 42 - WOD",
+    "Hero WOD Murph 1 de junio",
+    "Wod 9 de Dic",
+    "wod 30 de sept de 2025",
+    "<p>Wod 2 de enero</p>",
+]
+
+
+# Implementación original de n8.main (solo cambia que devuelve la fecha en lugar de
+# dejarla en fecha_dt_regex, que nunca se asignaba)
+def extraer_fecha_original(notes_break):
+    patrones_fecha = [
+        r'(?i)wod\s+(\d+)\s+de\s+(\w+)(?:\s+de\s+(\d{4}))?',
+        r'(?i)(\d+)\s+de\s+(\w+)(?:\s+de\s+(\d{4}))?',
+        r'(?i)(\w+)\s+(\d+)',
+        r'(?i)wod\s+(?:del?\s+)?(\w+)',
+        r'(?i)wod\s+(\w+)\s+(\d+)',
+        r'(?i)wod\s+del?\s+(\d+)/(\d+)(?:/(\d{4}))?',
+        r'(?i)wod\s+(\d+)\s+(?:de\s+)?(ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)',
+        r'(?i)(\d+)\s+(?:de\s+)?(ene|feb|mar|abr|may|jun|jul|ago|sep|oct|nov|dic)'
+    ]
+    for i, patron in enumerate(patrones_fecha):
+        dia = None
+        match = re.search(patron, notes_break)
+        if match:
+            grupos = match.groups()
+            if i == 2 or i == 4:
+                mes, dia = grupos[0], grupos[1] if len(grupos) > 1 else None
+                año = str(datetime.now().year)
+            elif i == 3:
+                mes = grupos[0]
+                if mes.lower() in ["abril", "abr"]:
+                    numeros = re.findall(r'\b(\d{1,2})\b', notes_break)
+                    for num in numeros:
+                        if 1 <= int(num) <= 30:
+                            dia = num
+                            break
+                    if not dia:
+                        dia = "15"
+                año = str(datetime.now().year)
+            elif i == 5:
+                dia, mes_num, año = grupos
+                mes_num = int(mes_num)
+                if not año:
+                    año = str(datetime.now().year)
+                meses_num_a_nombre = {
+                    1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
+                    5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
+                    9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
+                }
+                mes = meses_num_a_nombre.get(mes_num, "")
+            else:
+                if len(grupos) == 3:
+                    dia, mes, año = grupos
+                else:
+                    continue
+                if not año:
+                    año = str(datetime.now().year)
+
+            meses = {
+                'enero': 1, 'ene': 1,
+                'febrero': 2, 'feb': 2,
+                'marzo': 3, 'mar': 3,
+                'abril': 4, 'abr': 4,
+                'mayo': 5, 'may': 5,
+                'junio': 6, 'jun': 6,
+                'julio': 7, 'jul': 7,
+                'agosto': 8, 'ago': 8,
+                'septiembre': 9, 'sep': 9,
+                'octubre': 10, 'oct': 10,
+                'noviembre': 11, 'nov': 11,
+                'diciembre': 12, 'dic': 12
+            }
+            mes_num = None
+            if isinstance(mes, str):
+                mes_lower = mes.lower()
+                for nombre_mes, numero in meses.items():
+                    if mes_lower in nombre_mes or nombre_mes in mes_lower:
+                        mes_num = numero
+                        break
+
+            if mes_num and dia:
+                try:
+                    dia_num = int(dia)
+                    if 1 <= dia_num <= 31:
+                        return datetime(int(año), mes_num, dia_num)
+                except ValueError:
+                    pass
+    return None
+
+
+# Función para leer los notesBreak de respuestas grabadas del timeline de N8
+def leer_corpus(rutas):
+    textos = []
+    for ruta in rutas:
+        with open(ruta, "rb") as f:
+            datos = json.loads(f.read())
+        for elemento in datos.get("elements", []):
+            notas = elemento.get("notesBreak")
+            if notas:
+                textos.append(notas)
+    return textos
+
+
+def medir(funcion, textos, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for texto in textos:
+            funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", nargs="+", help="Respuestas grabadas del timeline de N8 de las que leer los notesBreak")
+    parser.add_argument("--dias", type=int, default=180, help="Días de histórico simulados")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = leer_corpus(args.corpus) if args.corpus else CORPUS
+    if not corpus:
+        print("El corpus no contiene ningún notesBreak")
+        sys.exit(1)
+    print(f"Corpus: {'grabado' if args.corpus else 'sintético'}, {len(corpus)} textos ({len(set(corpus))} distintos)")
+
+    # Comprobar que ambas implementaciones dan la misma fecha
+    diferencias = [
+        (texto, extraer_fecha_original(texto), extraer_fecha_notas(texto))
+        for texto in corpus
+        if extraer_fecha_original(texto) != extraer_fecha_notas(texto)
+    ]
+    for texto, original, nueva in diferencias:
+        print(f"DIFERENCIA {texto!r}: original={original} nueva={nueva}")
+    if diferencias:
+        sys.exit(1)
+
+    # Un elemento por clase y varias clases al día
+    textos = [corpus[i % len(corpus)] for i in range(args.dias * 6)]
+    t_original = medir(extraer_fecha_original, textos, args.repeticiones)
+    t_nueva = medir(extraer_fecha_notas, textos, args.repeticiones)
+
+    print(f"Textos procesados: {len(textos)}")
+    print(f"Original: {t_original * 1000:.1f} ms ({len(textos) / t_original:,.0f} textos/s)")
+    print(f"Nueva:    {t_nueva * 1000:.1f} ms ({len(textos) / t_nueva:,.0f} textos/s)")
+    print(f"Mejora:   x{t_original / t_nueva:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark del formateo de líneas de ejercicios (wod_scraper.formatear_ejercicio).
+
+Compara la versión anterior (lista de abreviaturas creada en cada llamada y hasta tres
+upper() por palabra) con la actual (frozenset + caché LRU de líneas) sobre varias
+semanas de WODs, en las que los movimientos se repiten mucho. Comprueba que ambas
+devuelven el mismo texto.
+
+Uso: python benchmarks/bench_formatear_ejercicio.py [--semanas 12] [--repeticiones 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+from wod_scraper import formatear_ejercicio  # noqa: E402
+
+# Líneas de movimientos tal y como llegan de N8 y CrossFitDB
+MOVIMIENTOS = [
+    "10 kb swings 24/16 kg", "15 wall balls 9/6 kg", "200 m run", "21 thrusters 43/29kg",
+    "12 t2b", "10 c2b pull ups", "5 bmu", "8 hspu", "50 du", "AMRAP 20'", "EMOM 12'",
+    "3 rds for time", "back squat 5x5 @ 75%", "deadlift 3-3-3-3-3", "box jump over 24/20",
+    "rx+ 30 cal row", "tc 12'", "10 db snatch alt", "20 kbsr", "ygig 3 rounds",
+    "sc 400m", "rope climb 3", "strict pull ups", "burpees over the bar", "   pistol squats  ",
+    "Hang Power Clean 60/40 KG", "double unders", "ring muscle ups", "toes to bar", "",
+]
+
+
+# Implementación anterior de wod_scraper.formatear_ejercicio
+def formatear_ejercicio_anterior(texto):
+    if not texto:
+        return ""
+    palabras = texto.strip().split()
+    resultado = []
+    mantener_mayusculas = ["KB", "DB", "RX", "AMRAP", "EMOM", "DU", "HSPU", "BMU", "TTB", "T2B", "C2B", "WB", "BOX", "YGIG", "SC", "KBSR"]
+    for palabra in palabras:
+        if palabra.upper() in mantener_mayusculas: resultado.append(palabra.upper())
+        elif palabra.upper().startswith("RX") or palabra.upper().startswith("TC"): resultado.append(palabra.upper())
+        elif any(c.isdigit() for c in palabra): resultado.append(palabra.lower())
+        else: resultado.append(palabra.capitalize())
+    return " ".join(resultado)
+
+
+# Función para generar las líneas de varias semanas (6 días, ~12 líneas por WOD)
+def generar_corpus(semanas):
+    aleatorio = random.Random(42)
+    return [aleatorio.choice(MOVIMIENTOS) for _ in range(semanas * 6 * 12)]
+
+
+def medir(funcion, lineas, repeticiones, limpiar_cache=False):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        if limpiar_cache:
+            funcion.cache_clear()
+        inicio = time.perf_counter()
+        for linea in lineas:
+            funcion(linea)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--semanas", type=int, default=12)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    # Comprobar que el texto es idéntico
+    diferencias = [m for m in MOVIMIENTOS if formatear_ejercicio_anterior(m) != formatear_ejercicio(m)]
+    for movimiento in diferencias:
+        print(f"DIFERENCIA {movimiento!r}: anterior={formatear_ejercicio_anterior(movimiento)!r} "
+              f"nueva={formatear_ejercicio(movimiento)!r}")
+    if diferencias:
+        sys.exit(1)
+
+    lineas = generar_corpus(args.semanas)
+    t_anterior = medir(formatear_ejercicio_anterior, lineas, args.repeticiones)
+    # Cada repetición empieza con la caché vacía: solo se aprovechan las repeticiones del propio corpus
+    t_nueva = medir(formatear_ejercicio, lineas, args.repeticiones, limpiar_cache=True)
+
+    print(f"Líneas procesadas: {len(lineas)} ({args.semanas} semanas)")
+    print(f"Anterior: {t_anterior * 1000:.2f} ms")
+    print(f"Nueva:    {t_nueva * 1000:.2f} ms ({formatear_ejercicio.cache_info()})")
+    print(f"Mejora:   x{t_anterior / t_nueva:.1f}")
+
+
+if __name__ == "__main__":
+    main()
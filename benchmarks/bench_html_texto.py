@@ -0,0 +1,123 @@
+"""
+Benchmark de la conversión de HTML a texto de los WODs.
+
+Compara la limpieza anterior basada en BeautifulSoup (la de n8 y la de crossfitdb)
+con html_texto sobre un corpus de descripciones de WOD: comprueba que el texto es
+idéntico y mide tiempo y pico de memoria (tracemalloc) de cada implementación.
+
+Necesita beautifulsoup4 instalado para ejecutar la versión anterior.
+
+Uso: python benchmarks/bench_html_texto.py [--repeticiones 200]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from html_texto import SUSTITUCIONES_CROSSFITDB, html_a_texto, sustituir_br  # noqa: E402
+
+# Descripciones de WOD con el HTML que devuelven el planner de nubapp y el timeline de N8,
+# más casos límite de HTML
+CORPUS = [
+    "<p>STRENGTH</p><p>Back squat 5x5 @ 75%</p><ul><li>10 Burpees</li><li>- 200m Run</li></ul>",
+    "<h2>WOD</h2><p>AMRAP 20'</p><ol><li>5 Pull ups</li><li>10 Push ups</li><li>15 Air squats</li></ol>",
+    "<p><strong>A) </strong>EMOM 12'</p><p>&nbsp;</p><p>Min 1: 12 cal row</p><p>Min 2: 10 T2B</p>",
+    "<p>For time:</p>\n<p>21-15-9</p>\n<p>Thrusters (43/29 kg)</p>\n<p>Pull-ups</p>",
+    "<div class=\"wod\"><span>METCON</span><br/>3 RDS<br />400 m Run<br>21 KBS</div>",
+    "A) BACK SQUAT 5X5<br>B) EMOM 12'<br><br>10 KBSR 24 kg<br/>200 m RUN<br><br>TEAM OF 2<br>3 RDS FOR TIME:",
+    "<p>&quot;Team of 2&quot;</p><p>Caf&eacute; &amp; descanso &#8211; 3&#x27; &#150; fin&hellip;</p>",
+    "<P>MAYÚSCULAS</P><BR>Texto <B>negrita</B> y <i>cursiva</i><Br />salto",
+    "<p class=\"ql-align-center\">Centrado</p><p>Normal</p><li class=\"x\">Item con clase</li>",
+    "<!-- comentario --><p>Tras comentario</p><script>var x = '<p>no</p>';</script><style>p{}</style>",
+    "<pre>  espacios   conservados\n\n  </pre><p>   </p><p>\n\n</p>",
+    "<ul>\n  <li>• Bullet</li>\n  <li>– Guion largo</li>\n  <li>a. Letra con punto</li>\n</ul>",
+    "Texto sin etiquetas\ncon saltos\n\n\n\ny espacios    múltiples",
+    "<p>Sin cerrar<p>otro párrafo<li>item suelto",
+    "<br></br><p>Cierre explícito de br</p><img src=x>Imagen</img>",
+    "<![CDATA[dato cdata]]><!DOCTYPE html><?pi algo?><p>fin</p>",
+    "&amp &lt;p&gt; &unknown; &#0; &#128; &#x1F600; &#xD800;",
+    "<table><tr><td>1</td><td>2</td></tr></table><h1>Título</h1><h3>Sub</h3>",
+    "",
+]
+
+
+def limpiar_html_n8_bs4(texto):
+    texto = re.sub(r'<br\s*/?>', '\n', texto, flags=re.IGNORECASE)
+    return BeautifulSoup(texto, "html.parser").get_text()
+
+
+def limpiar_html_n8_nuevo(texto):
+    return html_a_texto(texto, sustituir=sustituir_br)
+
+
+def limpiar_html_crossfitdb_bs4(texto):
+    texto = texto.replace("<br>", "\n").replace("<br />", "\n").replace("<br/>", "\n")
+    texto = texto.replace("<p>", "").replace("</p>", "\n")
+    texto = texto.replace("<h1>", "").replace("</h1>", "\n")
+    texto = texto.replace("<h2>", "").replace("</h2>", "\n")
+    texto = texto.replace("<h3>", "").replace("</h3>", "\n")
+    texto = texto.replace("<ul>", "").replace("</ul>", "")
+    texto = texto.replace("<ol>", "").replace("</ol>", "")
+    texto = texto.replace("<li>", "").replace("</li>", "\n")
+    return BeautifulSoup(texto, "html.parser").get_text(separator=" ")
+
+
+def limpiar_html_crossfitdb_nuevo(texto):
+    return html_a_texto(texto, " ", SUSTITUCIONES_CROSSFITDB.get)
+
+
+def medir(funcion, textos, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for texto in textos:
+            funcion(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    for texto in textos:
+        funcion(texto)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mejor, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    casos = [
+        ("n8", limpiar_html_n8_bs4, limpiar_html_n8_nuevo),
+        ("crossfitdb", limpiar_html_crossfitdb_bs4, limpiar_html_crossfitdb_nuevo),
+    ]
+
+    # Comprobar que el texto es idéntico
+    diferencias = 0
+    for nombre, anterior, nuevo in casos:
+        for texto in CORPUS:
+            if anterior(texto) != nuevo(texto):
+                diferencias += 1
+                print(f"DIFERENCIA ({nombre}) {texto!r}:\n  bs4:   {anterior(texto)!r}\n  nuevo: {nuevo(texto)!r}")
+    if diferencias:
+        sys.exit(1)
+
+    # Una semana de WODs con descripciones largas
+    textos = [texto * 4 for texto in CORPUS[:9]] * 4
+    for nombre, anterior, nuevo in casos:
+        t_anterior, m_anterior = medir(anterior, textos, args.repeticiones)
+        t_nuevo, m_nuevo = medir(nuevo, textos, args.repeticiones)
+        print(f"[{nombre}] {len(textos)} descripciones")
+        print(f"  bs4:   {t_anterior * 1000:.2f} ms, pico {m_anterior / 1024:.0f} KiB")
+        print(f"  nuevo: {t_nuevo * 1000:.2f} ms, pico {m_nuevo / 1024:.0f} KiB")
+        print(f"  mejora: x{t_anterior / t_nuevo:.1f} en tiempo, x{m_anterior / max(m_nuevo, 1):.1f} en memoria")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark del tiempo de importación de los módulos de Python de la app.
+
+Para cada módulo mide:
+- en frío: un intérprete nuevo que solo importa ese módulo (lo que paga la primera
+  sincronización en Chaquopy, sin contar el arranque del intérprete);
+- en templado: volver a importarlo en el mismo proceso quitando antes de sys.modules los
+  módulos de la app (las dependencias ya están cargadas, así que solo cuenta el código de
+  los módulos propios).
+
+Comprueba también que importar wod_scraper, n8 y crossfitdb no carga smtplib ni el
+paquete email (solo hacen falta al enviar correos). Con --referencia se mide además otro
+árbol de app/src/main/python (p. ej. sacado con git archive) para comparar.
+
+Uso: python benchmarks/bench_import.py [--repeticiones 7] [--referencia /tmp/anterior/app/src/main/python]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+RUTA_APP = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+MODULOS = [
+    "registro", "json_rapido", "config", "fechas", "html_texto", "documento_wod",
+    "correo_html", "payload_compacto", "n8", "crossfitdb", "wod_scraper",
+]
+
+# Módulos que solo deberían cargarse al enviar un correo
+MODULOS_CORREO = ["smtplib", "email.mime.multipart", "email.mime.text", "email.mime.nonmultipart"]
+
+CODIGO_FRIO = """
+import sys, time
+sys.path.insert(0, {ruta!r})
+inicio = time.perf_counter()
+import {modulo}
+fin = time.perf_counter()
+cargados = [m for m in {correo!r} if m in sys.modules]
+sys.stderr.write("RESULTADO %r %s\\n" % (fin - inicio, ",".join(cargados) or "-"))
+"""
+
+CODIGO_TEMPLADO = """
+import sys, time
+sys.path.insert(0, {ruta!r})
+import {modulo}
+mejor = float("inf")
+for _ in range({repeticiones}):
+    for nombre, modulo in list(sys.modules.items()):
+        if getattr(modulo, "__file__", None) and modulo.__file__.startswith({ruta!r}):
+            del sys.modules[nombre]
+    inicio = time.perf_counter()
+    import {modulo}
+    mejor = min(mejor, time.perf_counter() - inicio)
+sys.stderr.write("RESULTADO %r -\\n" % mejor)
+"""
+
+
+# Función para ejecutar un fragmento en un intérprete nuevo y leer su resultado
+def ejecutar(codigo, ruta):
+    proceso = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=ruta,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    for linea in proceso.stderr.splitlines():
+        if linea.startswith("RESULTADO "):
+            _, tiempo, cargados = linea.split(" ", 2)
+            return float(tiempo), cargados
+    return None, None
+
+
+def medir_frio(ruta, modulo, repeticiones):
+    mejor, cargados = None, None
+    for _ in range(repeticiones):
+        tiempo, cargados = ejecutar(CODIGO_FRIO.format(ruta=ruta, modulo=modulo, correo=MODULOS_CORREO), ruta)
+        if tiempo is None:
+            return None, None
+        mejor = tiempo if mejor is None else min(mejor, tiempo)
+    return mejor, cargados
+
+
+def medir_templado(ruta, modulo, repeticiones):
+    tiempo, _ = ejecutar(CODIGO_TEMPLADO.format(ruta=ruta, modulo=modulo, repeticiones=repeticiones), ruta)
+    return tiempo
+
+
+def formatear(tiempo):
+    return f"{tiempo * 1000:8.2f}" if tiempo is not None else "       -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--referencia", help="Otro árbol de app/src/main/python con el que comparar")
+    args = parser.parse_args()
+
+    arboles = [("actual", RUTA_APP)]
+    if args.referencia:
+        arboles.append(("referencia", os.path.abspath(args.referencia)))
+
+    # Una importación previa para que los .pyc estén generados (en el móvil ya vienen compilados)
+    for _, ruta in arboles:
+        for modulo in MODULOS:
+            ejecutar(CODIGO_FRIO.format(ruta=ruta, modulo=modulo, correo=MODULOS_CORREO), ruta)
+
+    cabecera = f"{'módulo':<18}" + "".join(f" {nombre + ' frío':>16} {nombre + ' templ.':>16}" for nombre, _ in arboles)
+    print("Tiempos en ms (mejor de", args.repeticiones, "ejecuciones)")
+    print(cabecera)
+    errores = []
+    for modulo in MODULOS:
+        fila = f"{modulo:<18}"
+        for nombre, ruta in arboles:
+            frio, cargados = medir_frio(ruta, modulo, args.repeticiones)
+            templado = medir_templado(ruta, modulo, args.repeticiones)
+            fila += f" {formatear(frio):>16} {formatear(templado):>16}"
+            if nombre == "actual" and modulo in ("n8", "crossfitdb", "wod_scraper") and cargados not in (None, "-"):
+                errores.append(f"importar {modulo} carga {cargados}")
+        print(fila)
+
+    if errores:
+        for error in errores:
+            print("ERROR:", error)
+        sys.exit(1)
+    print("Importar n8, crossfitdb y wod_scraper no carga smtplib ni email.mime")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark de la decodificación/codificación JSON (json_rapido frente a la librería estándar).
+
+Mide la decodificación de un timeline de N8 y de respuestas del planner de CrossFitDB, y la
+codificación del wods_json final de wod_scraper.main. Comprueba que los datos decodificados
+son los mismos y que el JSON generado vuelve a dar los mismos datos que json.dumps.
+
+Por defecto usa payloads sintéticos con la forma de los reales; se pueden pasar respuestas
+grabadas con --timeline y --planner. Sin orjson instalado ambas columnas usan la librería
+estándar.
+
+Uso: python benchmarks/bench_json.py [--timeline timeline.json] [--planner planner.json] [--repeticiones 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+import json_rapido  # noqa: E402
+from json_rapido import cargar_json, volcar_json  # noqa: E402
+
+DESCRIPCION = (
+    "<p>A) Back squat 5x5 @ 75%</p><p>B) AMRAP 20'</p><ul><li>10 KB swings 24/16 kg</li>"
+    "<li>15 wall balls</li><li>200 m run</li></ul><p>Team of 2 – “Cindy” 🏋️</p>"
+)
+
+
+# Función para generar un timeline con la forma del de AimHarder (muchos elementos por semana)
+def timeline_sintetico(semanas=12):
+    elementos = []
+    inicio = datetime(2025, 3, 3)
+    for i in range(semanas * 7 * 6):
+        dia = inicio + timedelta(days=i // 6)
+        elementos.append({
+            "id": 100000 + i,
+            "day": dia.strftime("%d %b"),
+            "when": dia.strftime("%Y-%m-%d 0%H:00:00"),
+            "notesBreak": f"WOD {dia.day} de marzo",
+            "wodClass": "CrossFit",
+            "likes": i % 17,
+            "comments": [{"user": f"atleta{j}", "text": "Buen WOD 💪", "likes": j} for j in range(i % 4)],
+            "TIPOWODs": [
+                {"notes": DESCRIPCION, "name": "WOD", "results": [{"score": j * 3.5, "rx": j % 2 == 0} for j in range(5)]},
+                {"notes": DESCRIPCION.upper(), "name": "Crossfit", "results": []},
+            ],
+        })
+    return {"elements": elementos, "next": None, "total": len(elementos)}
+
+
+# Función para generar la respuesta del planner de un día
+def planner_sintetico():
+    return {"data": {"workouts": [{"id_workout": 1, "description": DESCRIPCION * 3, "exercises": list(range(20))}]}}
+
+
+# Función para generar un wods_json de varias semanas
+def wods_json_sintetico(semanas=12):
+    wods = []
+    inicio = datetime(2025, 3, 3)
+    for i in range(semanas * 6):
+        fecha = inicio + timedelta(days=i)
+        wods.append({
+            "fecha": fecha, "fecha_iso": fecha.date().isoformat(), "fecha_formateada": fecha.strftime("%d/%m/%Y"),
+            "dia_semana": "Lunes", "contenido": DESCRIPCION * 2, "contenido_html": DESCRIPCION * 4,
+            "valor_orden": i, "gimnasio": "N8", "titulo": f"WOD DEL Lunes {fecha:%d/%m/%Y}",
+        })
+    return {"wods_n8": wods, "wods_crossfitdb": wods, "fecha_inicio": "03/03/2025", "fecha_fin": "08/03/2025", "total_wods": len(wods) * 2}
+
+
+def medir(funcion, dato, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(dato)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def leer(ruta, por_defecto):
+    if ruta:
+        with open(ruta, "rb") as f:
+            return f.read()
+    return json.dumps(por_defecto).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timeline", help="Respuesta grabada del timeline de N8")
+    parser.add_argument("--planner", help="Respuesta grabada del planner de CrossFitDB")
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    timeline = leer(args.timeline, timeline_sintetico())
+    planner = leer(args.planner, planner_sintetico())
+    wods_json = wods_json_sintetico()
+
+    # Comprobar que los resultados son los mismos
+    for nombre, cuerpo in (("timeline", timeline), ("planner", planner)):
+        if cargar_json(cuerpo) != json.loads(cuerpo):
+            print(f"DIFERENCIA al decodificar {nombre}")
+            sys.exit(1)
+    if json.loads(volcar_json(wods_json, default=str)) != json.loads(json.dumps(wods_json, default=str)):
+        print("DIFERENCIA al codificar wods_json")
+        sys.exit(1)
+
+    print(f"Backend: {'orjson' if json_rapido.orjson is not None else 'json (librería estándar)'}")
+    casos = [
+        (f"timeline ({len(timeline) / 1024:.0f} KiB)", json.loads, cargar_json, timeline),
+        (f"planner ({len(planner) / 1024:.1f} KiB)", json.loads, cargar_json, planner),
+        ("wods_json", lambda d: json.dumps(d, default=str), lambda d: volcar_json(d, default=str), wods_json),
+    ]
+    for nombre, estandar, rapido, dato in casos:
+        t_estandar = medir(estandar, dato, args.repeticiones)
+        t_rapido = medir(rapido, dato, args.repeticiones)
+        print(f"[{nombre}] estándar: {t_estandar * 1000:.3f} ms, json_rapido: {t_rapido * 1000:.3f} ms, mejora: x{t_estandar / t_rapido:.1f}")
+
+
+if __name__ == "__main__":
+    main()
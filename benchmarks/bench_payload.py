@@ -0,0 +1,130 @@
+"""
+Benchmark del payload de WODs que se pasa a Kotlin: JSON actual frente al esquema compacto.
+
+Compara tamaño, tiempo de codificación/decodificación y pico de memoria (tracemalloc) del
+JSON de wod_scraper (json_rapido con default=str; también con la librería estándar, que es
+lo que se usa en el móvil sin orjson) y de payload_compacto (msgpack si está instalado, si
+no JSON compacto). También muestra el tamaño sin contenido_html, que es el payload por
+defecto. Comprueba que el payload compacto se decodifica al mismo dict de partida y que el
+JSON equivale al de siempre.
+
+Uso: python benchmarks/bench_payload.py [--semanas 4] [--repeticiones 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+from json_rapido import cargar_json, volcar_json_bytes  # noqa: E402
+from payload_compacto import FORMATO_COMPACTO, codificar_compacto, decodificar_compacto  # noqa: E402
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+CONTENIDO = "A) BACK SQUAT 5X5 @ 75%\n\nB) AMRAP 20'\n        10 KB Swings 24/16 kg\n        15 Wall Balls\n⚡ 200 M RUN"
+CONTENIDO_HTML = (
+    '<div class="section-header">A) BACK SQUAT 5X5 @ 75%</div>\n'
+    '<div style="color: #000000; font-weight: 700;">AMRAP 20\'</div>\n'
+    '<div class="workout-details">10 KB Swings 24/16 kg</div>\n<div class="workout-details">15 Wall Balls</div>'
+)
+
+
+# Función para generar los WODs de N8 y CrossFitDB con los mismos campos que producen los scrapers
+def wods_sinteticos(semanas):
+    inicio = datetime(2025, 3, 3)
+    wods_n8, wods_crossfitdb = [], []
+    for i in range(semanas * 7):
+        fecha = inicio + timedelta(days=i)
+        dia_semana = DIAS_SEMANA[fecha.weekday()]
+        fecha_formateada = fecha.strftime("%d/%m/%Y")
+        titulo = f"WOD DEL {dia_semana} {fecha_formateada}"
+        wods_n8.append({
+            "fecha": fecha, "fecha_iso": fecha.strftime("%Y-%m-%d"), "fecha_formateada": fecha_formateada,
+            "dia_semana": dia_semana, "contenido": CONTENIDO, "contenido_html": CONTENIDO_HTML,
+            "valor_orden": fecha.weekday() + 1, "gimnasio": "N8", "titulo": titulo, "clase": "CrossFit",
+        })
+        wods_crossfitdb.append({
+            "fecha": fecha, "dia_semana": dia_semana, "fecha_formateada": fecha_formateada,
+            "contenido": CONTENIDO, "texto_completo": f"{titulo}\n" + "=" * 40 + "\n" + CONTENIDO,
+            "id_wod": str(1000 + i), "valor_orden": fecha.weekday() + 1, "fecha_iso": fecha.strftime("%Y-%m-%d"),
+            "contenido_html": CONTENIDO_HTML, "gimnasio": "CrossFitDB", "titulo": titulo,
+        })
+    return {
+        "wods_n8": wods_n8, "wods_crossfitdb": wods_crossfitdb,
+        "fecha_inicio": inicio.strftime("%d/%m/%Y"), "fecha_fin": (inicio + timedelta(days=semanas * 7 - 1)).strftime("%d/%m/%Y"),
+        "total_wods": len(wods_n8) + len(wods_crossfitdb),
+    }
+
+
+def codificar_json(wods):
+    return volcar_json_bytes(wods, default=str)
+
+
+def medir(funcion, dato, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(dato)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcion(dato)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mejor, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--semanas", type=int, default=4)
+    parser.add_argument("--repeticiones", type=int, default=50)
+    args = parser.parse_args()
+
+    wods = wods_sinteticos(args.semanas)
+    datos_json = codificar_json(wods)
+    datos_compactos = codificar_compacto(wods)
+
+    # Comprobar que el payload compacto vuelve al mismo dict
+    if decodificar_compacto(datos_compactos) != wods:
+        print("DIFERENCIA: el payload compacto no se decodifica al dict original")
+        sys.exit(1)
+    if cargar_json(datos_json) != json.loads(json.dumps(wods, default=str)):
+        print("DIFERENCIA: el JSON no equivale al de json.dumps")
+        sys.exit(1)
+
+    print(f"{wods['total_wods']} WODs ({args.semanas} semanas), formato compacto: {FORMATO_COMPACTO}")
+    print(f"Tamaño: JSON {len(datos_json) / 1024:.1f} KiB, compacto {len(datos_compactos) / 1024:.1f} KiB "
+          f"({100 * len(datos_compactos) / len(datos_json):.0f}%)")
+    # Payload por defecto de wod_scraper.obtener_wods: sin contenido_html
+    sin_html = {
+        clave: [{campo: valor for campo, valor in wod.items() if campo != "contenido_html"} for wod in valor]
+        if clave in ("wods_n8", "wods_crossfitdb") else valor
+        for clave, valor in wods.items()
+    }
+    print(f"Sin contenido_html: JSON {len(codificar_json(sin_html)) / 1024:.1f} KiB, "
+          f"compacto {len(codificar_compacto(sin_html)) / 1024:.1f} KiB")
+    casos = [
+        ("codificar", [
+            ("JSON estándar", lambda d: json.dumps(d, default=str).encode("utf-8"), wods),
+            ("JSON json_rapido", codificar_json, wods),
+            ("compacto", codificar_compacto, wods),
+        ]),
+        ("decodificar", [
+            ("JSON estándar", json.loads, datos_json),
+            ("JSON json_rapido", cargar_json, datos_json),
+            ("compacto", decodificar_compacto, datos_compactos),
+        ]),
+    ]
+    for nombre, variantes in casos:
+        print(f"[{nombre}]")
+        for variante, funcion, dato in variantes:
+            tiempo, pico = medir(funcion, dato, args.repeticiones)
+            print(f"  {variante:<17} {tiempo * 1000:.3f} ms, pico {pico / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark del registro de mensajes de los scrapers (registro.py frente a log_message).
+
+Simula los mensajes que n8.procesar_timeline escribe por cada elemento del timeline y
+compara la versión anterior (import de android.util.Log en cada llamada y print de cada
+línea) con registro.py: nivel INFO con DEBUG desactivado (lo habitual en la app), nivel
+DEBUG (mismas líneas que antes, pero volcadas por lotes) y debug() con formato perezoso.
+Antes de medir comprueba que con DEBUG activo se escriben exactamente las mismas líneas.
+
+Uso: python benchmarks/bench_registro.py [--elementos 2000] [--repeticiones 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+import registro  # noqa: E402
+from registro import depuracion, obtener_registro  # noqa: E402
+
+NOTAS = "<p>WOD</p><p>A) Back squat 5x5 @ 75%</p><p>B) AMRAP 20' 10 KB swings 24/16 kg 15 wall balls</p>" * 3
+
+
+# Implementación anterior de wod_scraper.log_message
+def log_message(message, tag="WodScraper"):
+    try:
+        from android.util import Log
+        Log.d(tag, str(message))
+    except ImportError:
+        print(f"[{tag}] {message}")
+
+
+# Función que escribe los mensajes de un elemento del timeline como hace n8.procesar_timeline
+def mensajes_elemento(log_func, log_debug, i):
+    if log_debug:
+        log_debug(f"Intentando parsear fecha desde campo 'day': {i % 28 + 1} Mar")
+        log_debug(f"-- Evaluando Filtro Día/Tipo para ID {i} (Monday {i % 28 + 1:02d}/03) --")
+        log_debug("   Tipo Esperado: WOD inicial")
+        for j in range(2):
+            log_debug(f"   -> Evaluando TIPOWODs[{j}] notes: '{NOTAS[:60]}...'")
+        log_debug("   Resultado Filtro: FALLA")
+    if i % 50 == 0:
+        log_func(f"✅ Procesando WOD ID {i} para Monday {i % 28 + 1:02d}/03 (Origen: API field 'day', Tipo: WOD inicial)")
+
+
+# Función con los mismos mensajes de depuración usando el formato perezoso de debug()
+def mensajes_elemento_perezoso(registro_n8, i):
+    registro_n8.debug("Intentando parsear fecha desde campo 'day': %d Mar", i % 28 + 1)
+    registro_n8.debug("-- Evaluando Filtro Día/Tipo para ID %d (Monday %02d/03) --", i, i % 28 + 1)
+    registro_n8.debug("   Tipo Esperado: WOD inicial")
+    for j in range(2):
+        registro_n8.debug("   -> Evaluando TIPOWODs[%d] notes: '%.60s...'", j, NOTAS)
+    registro_n8.debug("   Resultado Filtro: FALLA")
+    if i % 50 == 0:
+        registro_n8.info("✅ Procesando WOD ID %d para Monday %02d/03 (Origen: API field 'day', Tipo: WOD inicial)", i, i % 28 + 1)
+
+
+def ejecutar_anterior(elementos):
+    log_func = lambda msg: log_message(msg, tag="WodN8")
+    for i in range(elementos):
+        mensajes_elemento(log_func, log_func, i)
+
+
+def ejecutar_registro(elementos):
+    registro_n8 = obtener_registro("WodN8")
+    log_debug = depuracion(registro_n8)
+    for i in range(elementos):
+        mensajes_elemento(registro_n8, log_debug, i)
+    registro.volcar()
+
+
+def ejecutar_perezoso(elementos):
+    registro_n8 = obtener_registro("WodN8")
+    for i in range(elementos):
+        mensajes_elemento_perezoso(registro_n8, i)
+    registro.volcar()
+
+
+def medir(funcion, elementos, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcion(elementos)
+            mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def salida(funcion, elementos):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        funcion(elementos)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--elementos", type=int, default=2000, help="Elementos del timeline por ejecución")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    # Con DEBUG activo las líneas escritas deben ser las mismas que antes
+    registro.establecer_nivel("DEBUG")
+    anterior = salida(ejecutar_anterior, args.elementos)
+    for nombre, funcion in (("registro", ejecutar_registro), ("perezoso", ejecutar_perezoso)):
+        if salida(funcion, args.elementos) != anterior:
+            print(f"DIFERENCIA en la salida de {nombre}")
+            sys.exit(1)
+    print(f"Salida con DEBUG idéntica ({len(anterior.splitlines())} líneas)")
+
+    t_anterior = medir(ejecutar_anterior, args.elementos, args.repeticiones)
+    t_debug = medir(ejecutar_registro, args.elementos, args.repeticiones)
+    registro.establecer_nivel("INFO")
+    t_info = medir(ejecutar_registro, args.elementos, args.repeticiones)
+    t_perezoso = medir(ejecutar_perezoso, args.elementos, args.repeticiones)
+
+    print(f"Elementos procesados: {args.elementos}")
+    print(f"Anterior (log_message):       {t_anterior * 1000:.2f} ms")
+    print(f"registro, nivel DEBUG:        {t_debug * 1000:.2f} ms (x{t_anterior / t_debug:.1f})")
+    print(f"registro, nivel INFO:         {t_info * 1000:.2f} ms (x{t_anterior / t_info:.1f})")
+    print(f"debug() perezoso, nivel INFO: {t_perezoso * 1000:.2f} ms (x{t_anterior / t_perezoso:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Tabla de casos de fechas.inferir_fecha_api (año de las fechas "día mes" del timeline de N8).
+
+Los valores esperados son los que daba la versión anterior (parsear_fecha_api de n8.py,
+copiada en benchmarks/bench_fecha_api.py).
+
+Uso: python -m pytest tests
+"""
+import os
+import sys
+from datetime import date, datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "src", "main", "python"))
+
+from fechas import año_de_when, inferir_fecha_api  # noqa: E402
+
+# (día, mes, año de "when", referencia) -> fecha esperada
+CASOS = [
+    # Mismo mes
+    (15, 3, None, date(2025, 3, 10), datetime(2025, 3, 15)),
+    (1, 10, 2025, date(2025, 10, 31), datetime(2025, 10, 1)),
+
+    # Cambios de mes: último día del mes con la API en el día 1 del siguiente...
+    (1, 2, None, date(2025, 1, 31), datetime(2025, 2, 1)),
+    (1, 3, None, date(2025, 2, 28), datetime(2025, 3, 1)),
+    (1, 4, None, date(2025, 3, 31), datetime(2025, 4, 1)),
+    (1, 5, None, date(2025, 4, 30), datetime(2025, 5, 1)),
+    (1, 6, None, date(2025, 5, 31), datetime(2025, 6, 1)),
+    (1, 7, None, date(2025, 6, 30), datetime(2025, 7, 1)),
+    (1, 8, None, date(2025, 7, 31), datetime(2025, 8, 1)),
+    (1, 9, None, date(2025, 8, 31), datetime(2025, 9, 1)),
+    (1, 10, None, date(2025, 9, 30), datetime(2025, 10, 1)),
+    (1, 11, None, date(2025, 10, 31), datetime(2025, 11, 1)),
+    (1, 12, None, date(2025, 11, 30), datetime(2025, 12, 1)),
+    (1, 1, 2026, date(2025, 12, 31), datetime(2026, 1, 1)),
+    # ... y primer día del mes con la API en el último día del anterior
+    (31, 1, None, date(2025, 2, 1), datetime(2025, 1, 31)),
+    (28, 2, None, date(2025, 3, 1), datetime(2025, 2, 28)),
+    (31, 3, None, date(2025, 4, 1), datetime(2025, 3, 31)),
+    (30, 4, None, date(2025, 5, 1), datetime(2025, 4, 30)),
+    (31, 5, None, date(2025, 6, 1), datetime(2025, 5, 31)),
+    (30, 6, None, date(2025, 7, 1), datetime(2025, 6, 30)),
+    (31, 7, None, date(2025, 8, 1), datetime(2025, 7, 31)),
+    (31, 8, None, date(2025, 9, 1), datetime(2025, 8, 31)),
+    (30, 9, None, date(2025, 10, 1), datetime(2025, 9, 30)),
+    (31, 10, None, date(2025, 11, 1), datetime(2025, 10, 31)),
+    (30, 11, None, date(2025, 12, 1), datetime(2025, 11, 30)),
+    (31, 12, 2025, date(2026, 1, 1), datetime(2025, 12, 31)),
+
+    # Umbral de fin de mes (25, 23 en meses de 30 días, 22 en febrero)
+    (3, 3, None, date(2025, 2, 22), datetime(2025, 3, 3)),
+    (2, 7, None, date(2025, 6, 23), datetime(2025, 7, 2)),
+    (5, 11, None, date(2025, 10, 25), datetime(2025, 11, 5)),
+
+    # Vuelta de diciembre a enero
+    (5, 1, None, date(2025, 12, 20), datetime(2026, 1, 5)),
+    (5, 1, 2026, date(2025, 12, 20), datetime(2026, 1, 5)),
+    (2, 1, 2026, date(2025, 12, 29), datetime(2026, 1, 2)),
+    (29, 12, 2025, date(2026, 1, 3), datetime(2025, 12, 29)),
+    (22, 12, 2025, date(2026, 1, 10), datetime(2025, 12, 22)),
+    # Sin "when" y a fin de diciembre se queda en el año de la referencia
+    (1, 1, None, date(2025, 12, 31), datetime(2025, 1, 1)),
+
+    # Meses lejanos al de la referencia
+    (20, 11, None, date(2025, 1, 15), datetime(2024, 11, 20)),
+    (15, 2, None, date(2025, 12, 10), datetime(2026, 2, 15)),
+    (15, 6, None, date(2025, 10, 15), datetime(2026, 6, 15)),
+
+    # Caso especial marzo-abril
+    (20, 4, None, date(2025, 3, 5), datetime(2025, 4, 20)),
+    (30, 4, None, date(2025, 3, 20), datetime(2025, 4, 30)),
+    (20, 3, None, date(2025, 4, 8), datetime(2025, 3, 20)),
+    (28, 3, None, date(2025, 4, 15), datetime(2025, 3, 28)),
+    (25, 3, None, date(2025, 4, 20), datetime(2025, 3, 25)),
+    (10, 3, None, date(2025, 4, 15), datetime(2026, 3, 10)),
+    (24, 3, 2025, date(2025, 4, 11), datetime(2026, 3, 24)),
+
+    # 29 de febrero
+    (29, 2, 2024, date(2024, 2, 20), datetime(2024, 2, 29)),
+]
+
+
+@pytest.mark.parametrize("dia, mes, año_when, referencia, esperado", CASOS)
+def test_inferir_fecha_api(dia, mes, año_when, referencia, esperado):
+    assert inferir_fecha_api(dia, mes, año_when, referencia) == esperado
+
+
+# Las fechas que no existen lanzan ValueError (n8.parsear_fecha_api devuelve None, como antes)
+@pytest.mark.parametrize("dia, mes, año_when, referencia", [
+    (30, 2, None, date(2025, 2, 10)),
+    (29, 2, 2025, date(2025, 2, 10)),
+    (31, 4, None, date(2025, 4, 10)),
+])
+def test_inferir_fecha_api_fecha_inexistente(dia, mes, año_when, referencia):
+    with pytest.raises(ValueError):
+        inferir_fecha_api(dia, mes, año_when, referencia)
+
+
+@pytest.mark.parametrize("when, esperado", [
+    ("2025-03-28 07:00:00", 2025),
+    ("20250328070000", 2025),
+    ("1999-12-31 07:00:00", None),
+    ("2101-01-01 07:00:00", None),
+    ("abcd-ef-gh", None),
+    ("2025", None),
+    ("", None),
+    (None, None),
+])
+def test_año_de_when(when, esperado):
+    assert año_de_when(when) == esperado